@@ -0,0 +1,78 @@
+import gc
+import json
+import random
+import argparse
+import tracemalloc
+from company_record import CompanyRecord
+
+# --- Configuration ---
+DEFAULT_RECORDS = 50000
+SEED = 42
+INDUSTRIES = [
+    "Software Development", "IT Services and IT Consulting", "Technology, Information and Internet", "Financial Services",
+    "Banking", "Entertainment Providers", "Computer Hardware Manufacturing", "Research Services", "Biotechnology Research",
+    "Translation and Localization", "Retail", "Hospitals and Health Care", "Higher Education", "Staffing and Recruiting",
+]
+COMPANY_SIZES = ["2-10 employees", "11-50 employees", "51-200 employees", "201-500 employees", "501-1,000 employees",
+                 "1,001-5,000 employees", "5,001-10,000 employees", "10,001+ employees"]
+HEADQUARTERS = [("Mumbai, Maharashtra", "Mumbai", "IN-MH", "IN"), ("Bengaluru, Karnataka", "Bengaluru", "IN-KA", "IN"),
+                ("Toronto, Ontario", "Toronto", "CA-ON", "CA"), ("San Francisco, CA", "San Francisco", "US-CA", "US"),
+                ("New York, NY", "New York", "US-NY", "US"), ("London, England", "London", "GB-ENG", "GB"),
+                ("Redmond, Washington", "Redmond", "US-WA", "US"), ("Paris, France", "Paris", "FR-IDF", "FR")]
+WORDS = "we build cloud software data platform services for teams customers global leading solutions".split()
+
+#<editor-fold desc="Synthetic Corpus">
+
+def synthetic_lines(count, seed=SEED):
+    """JSONL lines shaped like stamped, location-normalized scraper output; some fields missing, as live."""
+    rng = random.Random(seed)
+    for i in range(count):
+        slug = f"company-{i}"
+        record = {"company_slug": slug, "followers": f"{rng.randint(1, 999)}{rng.choice(['', 'K', 'M'])} followers"}
+        if rng.random() < 0.9: record["overview"] = " ".join(rng.choices(WORDS, k=rng.randint(20, 60)))
+        if rng.random() < 0.8: record["website"] = f"https://www.{slug}.com"
+        record["industry"] = rng.choice(INDUSTRIES)
+        record["company_size"] = rng.choice(COMPANY_SIZES)
+        if rng.random() < 0.75:
+            record["headquarters"], record["hq_city"], record["hq_region"], record["hq_country"] = rng.choice(HEADQUARTERS)
+        if rng.random() < 0.6: record["job_openings_text"] = f"{slug} has {rng.randint(1, 5000)} job openings - find the one for you."
+        record["scraped_at"] = 1_700_000_000 + rng.randint(0, 10_000_000)
+        record["content_hash"] = f"{rng.getrandbits(64):016x}"
+        yield json.dumps(record, ensure_ascii=False)
+#</editor-fold>
+
+#<editor-fold desc="Measurement">
+
+def retained_bytes(build):
+    """Bytes still allocated after `build()` returns, i.e. the resident cost of what it returned."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+def run_benchmark(count):
+    lines = list(synthetic_lines(count))
+    dicts, dict_bytes, dict_peak = retained_bytes(lambda: [json.loads(line) for line in lines])
+    records, record_bytes, record_peak = retained_bytes(lambda: [CompanyRecord.from_dict(json.loads(line)) for line in lines])
+    lossless = all(record.to_dict() == original for record, original in zip(records, dicts))
+    return {"records": count, "lossless": lossless,
+            "dict": {"bytes": dict_bytes, "peak": dict_peak}, "company_record": {"bytes": record_bytes, "peak": record_peak}}
+
+def print_report(result):
+    count = result["records"]
+    print(f"--- Resident memory for {count} synthetic records ---")
+    for name in ("dict", "company_record"):
+        stats = result[name]
+        print(f"  {name:<16}{stats['bytes'] / 2**20:>10.1f} MB  {stats['bytes'] / count:>8.0f} B/record  (peak {stats['peak'] / 2**20:.1f} MB)")
+    saved = 1 - result["company_record"]["bytes"] / result["dict"]["bytes"]
+    print(f"  CompanyRecord saves {saved:.1%}; round trip {'lossless' if result['lossless'] else 'LOSSY'}.")
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the memory footprint of record dicts and CompanyRecord on a synthetic corpus.")
+    parser.add_argument("--records", type=int, default=DEFAULT_RECORDS)
+    args = parser.parse_args()
+    print_report(run_benchmark(args.records))
@@ -0,0 +1,211 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+import linkedin_scraper
+from frontier import DiscoveryFrontier
+
+# --- Configuration ---
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures")
+BASELINE_FILE = "bench_baseline.json"
+DEFAULT_ITERATIONS = 10
+DEFAULT_WAIT_TIME = 3  # seconds; each missing field costs one full wait, as WAIT_TIME does live
+DEFAULT_SLEEP_SCALE = 0.1  # fraction of each deliberate sleep actually slept
+DEFAULT_TOLERANCE = 0.25  # allowed p50 slowdown versus the baseline before failing
+
+#<editor-fold desc="Local Fixture Server">
+
+ROUTES = [
+    (re.compile(r'^/company/(?P<slug>sparse-[^/]+)/about/?$'), "company_about_sparse.html"),
+    (re.compile(r'^/(?:company|showcase)/(?P<slug>[^/]+)/(?:about/?)?$'), "company_about.html"),
+    (re.compile(r'^/company/(?P<slug>[^/]+)/jobs/?$'), "company_jobs.html"),
+    (re.compile(r'^/search/results/companies/?$'), "search_results.html"),
+]
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves recorded company, jobs and search pages with the slug and query substituted in."""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        for pattern, fixture_name in ROUTES:
+            match = pattern.match(parsed.path)
+            if not match: continue
+            with open(os.path.join(FIXTURES_DIR, fixture_name), 'r', encoding='utf-8') as f:
+                body = f.read()
+            slug = match.groupdict().get("slug", "")
+            query = parse_qs(parsed.query)
+            substitutions = {"{slug}": slug, "{name}": slug.replace('-', ' ').title(),
+                             "{keywords}": query.get("keywords", ["bench"])[0].lower().replace(' ', '-'), "{page}": query.get("page", ["1"])[0]}
+            for placeholder, value in substitutions.items():
+                body = body.replace(placeholder, value)
+            self._respond(200, body)
+            return
+        self._respond(404, "<html><head><title>Page not found</title></head><body></body></html>")
+
+    def _respond(self, status, body):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+#</editor-fold>
+
+#<editor-fold desc="Wait and Sleep Accounting">
+
+class PhaseClock:
+    """Accumulates time spent in WebDriverWait lookups and deliberate sleeps during one call."""
+
+    def __init__(self, sleep_scale):
+        self.sleep_scale = sleep_scale
+        self.reset()
+
+    def reset(self):
+        self.wait_seconds = 0.0
+        self.sleep_seconds = 0.0
+        self.timeouts = 0
+
+    def sleep(self, seconds):
+        self.sleep_seconds += seconds
+        time.sleep(seconds * self.sleep_scale)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+class TimedWait(WebDriverWait):
+    def __init__(self, driver, timeout, clock):
+        super().__init__(driver, timeout)
+        self.clock = clock
+
+    def until(self, method, message=""):
+        start = time.perf_counter()
+        try:
+            return super().until(method, message)
+        except TimeoutException:
+            self.clock.timeouts += 1
+            raise
+        finally:
+            self.clock.wait_seconds += time.perf_counter() - start
+#</editor-fold>
+
+#<editor-fold desc="Benchmark Cases">
+
+def build_headless_driver(chromedriver_path=None):
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    service = ChromeService(chromedriver_path) if chromedriver_path else ChromeService()
+    return webdriver.Chrome(service=service, options=options)
+
+def benchmark_cases(driver, wait, base_url):
+    """(name, setup, call) triples; `setup` runs untimed before each timed `call`."""
+    def no_setup(i): pass
+    def load_about_page(i): driver.get(f"{base_url}/company/bench-discovery-{i}/about/")
+    return [
+        ("scrape_company_data", no_setup, lambda i: linkedin_scraper.scrape_company_data(driver, wait, f"bench-co-{i}")),
+        ("scrape_company_data[sparse]", no_setup, lambda i: linkedin_scraper.scrape_company_data(driver, wait, f"sparse-co-{i}")),
+        ("find_first_new_company_on_page", no_setup, lambda i: linkedin_scraper.find_first_new_company_on_page(driver, wait, "Fintech", i + 1, set())),
+        ("discover_new_companies", load_about_page, lambda i: linkedin_scraper.discover_new_companies(driver, wait, set(), DiscoveryFrontier(), f"bench-discovery-{i}")),
+    ]
+
+def percentile(values, q):
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+def run_benchmarks(iterations, wait_time, sleep_scale, chromedriver_path=None):
+    server, base_url = start_fixture_server()
+    clock = PhaseClock(sleep_scale)
+    original_base_url, original_time = linkedin_scraper.LINKEDIN_BASE_URL, linkedin_scraper.time
+    linkedin_scraper.LINKEDIN_BASE_URL, linkedin_scraper.time = base_url, clock
+    driver, results = None, {}
+    try:
+        driver = build_headless_driver(chromedriver_path)
+        wait = TimedWait(driver, wait_time, clock)
+        for name, setup, call in benchmark_cases(driver, wait, base_url):
+            samples = []
+            for i in range(iterations):
+                setup(i)
+                clock.reset()
+                start = time.perf_counter()
+                call(i)
+                samples.append((time.perf_counter() - start, clock.wait_seconds, clock.sleep_seconds, clock.timeouts))
+            latencies = [s[0] for s in samples]
+            results[name] = {
+                "n": len(samples),
+                "p50": percentile(latencies, 50), "p90": percentile(latencies, 90), "p99": percentile(latencies, 99),
+                "mean_wait": sum(s[1] for s in samples) / len(samples),
+                "mean_sleep_requested": sum(s[2] for s in samples) / len(samples),
+                "timeouts_per_call": sum(s[3] for s in samples) / len(samples),
+            }
+    finally:
+        if driver: driver.quit()
+        server.shutdown()
+        linkedin_scraper.LINKEDIN_BASE_URL, linkedin_scraper.time = original_base_url, original_time
+    return results
+#</editor-fold>
+
+#<editor-fold desc="Reporting and Regression Checks">
+
+def print_report(results, sleep_scale):
+    print(f"\n{'function':<32}{'n':>4}{'p50 s':>9}{'p90 s':>9}{'p99 s':>9}{'wait s':>9}{'sleep s':>9}{'timeouts':>10}")
+    for name, stats in results.items():
+        print(f"{name:<32}{stats['n']:>4}{stats['p50']:>9.3f}{stats['p90']:>9.3f}{stats['p99']:>9.3f}"
+              f"{stats['mean_wait']:>9.3f}{stats['mean_sleep_requested']:>9.3f}{stats['timeouts_per_call']:>10.2f}")
+    print(f"(wait/sleep columns are per-call means; sleeps are the requested durations, actually slept at x{sleep_scale})")
+
+def check_regressions(results, baseline, tolerance):
+    regressions = []
+    for name, stats in results.items():
+        if name not in baseline: continue
+        allowed = baseline[name]["p50"] * (1 + tolerance)
+        if stats["p50"] > allowed:
+            regressions.append(f"{name}: p50 {stats['p50']:.3f}s exceeds baseline {baseline[name]['p50']:.3f}s (+{tolerance:.0%} allowed)")
+    return regressions
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraping functions against local fixture pages in headless Chrome.")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--wait-time", type=float, default=DEFAULT_WAIT_TIME, help="WebDriverWait timeout used for the run.")
+    parser.add_argument("--sleep-scale", type=float, default=DEFAULT_SLEEP_SCALE, help="Fraction of deliberate sleeps actually slept.")
+    parser.add_argument("--chromedriver", help="Path to a local chromedriver binary (needed on offline machines).")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    bench_results = run_benchmarks(args.iterations, args.wait_time, args.sleep_scale, args.chromedriver)
+    print_report(bench_results, args.sleep_scale)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(bench_results, f, indent=2)
+        print(f"Baseline saved to '{args.baseline}'.")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            found = check_regressions(bench_results, json.load(f), args.tolerance)
+        for line in found: print(f"!!! REGRESSION: {line} !!!")
+        if found: sys.exit(1)
+        print(f"No regressions against '{args.baseline}'.")
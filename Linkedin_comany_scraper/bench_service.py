@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import quote
+from query_service import DEFAULT_HOST, DEFAULT_PORT
+
+# --- Configuration ---
+DEFAULT_REQUESTS = 20000
+DEFAULT_CONNECTIONS = 32
+STARTUP_TIMEOUT = 30  # seconds to wait for a spawned service to accept connections
+
+#<editor-fold desc="HTTP Client">
+
+async def fetch(reader, writer, target, host):
+    """One keep-alive GET; returns (status, body)."""
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1')
+    status = int(head.split(" ", 2)[1])
+    length = next(int(line.split(":", 1)[1]) for line in head.split("\r\n") if line.lower().startswith("content-length:"))
+    return status, await reader.readexactly(length)
+
+async def wait_for_service(host, port):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            status, body = await fetch(reader, writer, "/health", host)
+            writer.close()
+            return json.loads(body)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError):
+            if time.monotonic() > deadline: raise
+            await asyncio.sleep(0.2)
+#</editor-fold>
+
+#<editor-fold desc="Load Generation">
+
+async def build_targets(host, port, count, seed):
+    """A mix of slug lookups, filtered listings and aggregates drawn from the live corpus."""
+    reader, writer = await asyncio.open_connection(host, port)
+    _, body = await fetch(reader, writer, "/companies?limit=500", host)
+    slugs = [item["company_slug"] for item in json.loads(body)["items"]]
+    _, body = await fetch(reader, writer, "/aggregates/industry?limit=50", host)
+    industries = [item["value"] for item in json.loads(body)["items"]]
+    writer.close()
+    rng = random.Random(seed)
+    kinds = [
+        lambda: f"/companies/{quote(rng.choice(slugs))}" if slugs else "/health",
+        lambda: f"/companies?industry={quote(rng.choice(industries))}&limit=20&offset={rng.choice([0, 20])}" if industries else "/companies",
+        lambda: f"/aggregates/{rng.choice(['industry', 'company_size', 'hq_country', 'domain'])}?limit=20",
+    ]
+    return [rng.choices(kinds, weights=[6, 3, 1])[0]() for _ in range(count)]
+
+async def run_load(host, port, targets, connections):
+    latencies, errors = [], 0
+    queue = iter(targets)
+
+    async def worker():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        for target in queue:
+            started = time.perf_counter()
+            status, _ = await fetch(reader, writer, target, host)
+            latencies.append(time.perf_counter() - started)
+            if status != 200: errors += 1
+        writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    return latencies, errors, time.perf_counter() - started
+
+def percentile(values, q):
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+async def benchmark(host, port, requests, connections, seed):
+    health = await wait_for_service(host, port)
+    targets = await build_targets(host, port, requests, seed)
+    cold_latencies, cold_errors, cold_elapsed = await run_load(host, port, targets, connections)
+    warm_latencies, warm_errors, warm_elapsed = await run_load(host, port, targets, connections)
+    print(f"--- {requests} requests over {connections} connections, {health['companies']} companies ---")
+    for label, latencies, errors, elapsed in (("first pass", cold_latencies, cold_errors, cold_elapsed),
+                                              ("cached pass", warm_latencies, warm_errors, warm_elapsed)):
+        print(f"  {label:<12}{len(latencies) / elapsed:>10.0f} req/s   p50 {percentile(latencies, 50) * 1000:>7.2f} ms"
+              f"   p99 {percentile(latencies, 99) * 1000:>7.2f} ms   non-200: {errors}")
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the local query service and report requests/sec and latency percentiles.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--spawn", metavar="DATA_FILE", help="Start query_service.py on this data file for the run.")
+    args = parser.parse_args()
+
+    service_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_service.py")
+    service = subprocess.Popen([sys.executable, service_script, args.spawn, "--host", args.host, "--port", str(args.port)],
+                               stdout=subprocess.DEVNULL) if args.spawn else None
+    try:
+        asyncio.run(benchmark(args.host, args.port, args.requests, args.connections, args.seed))
+    finally:
+        if service:
+            service.terminate()
+            service.wait()
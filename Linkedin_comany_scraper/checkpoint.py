@@ -0,0 +1,60 @@
+import os
+import json
+import time
+import signal
+
+# --- Configuration ---
+CHECKPOINT_FILE = "crawl_checkpoint.json"
+CHECKPOINT_EVERY = 25  # completed page visits between automatic checkpoints
+
+class CheckpointManager:
+    """Atomically snapshots the crawl loop's state so `--resume` can continue exactly where a run stopped.
+
+    Snapshots are written to a temp file, fsynced and renamed into place, so a crash mid-write
+    always leaves the previous checkpoint intact. SIGTERM stops the run through the normal
+    shutdown path (which writes a final checkpoint); SIGUSR1, where available, requests an
+    extra snapshot at the next loop iteration.
+    """
+
+    def __init__(self, file_path=CHECKPOINT_FILE, every=CHECKPOINT_EVERY):
+        self.file_path = file_path
+        self.every = every
+        self.requested = False
+
+    def install_signal_handlers(self):
+        def stop(signum, frame):
+            raise KeyboardInterrupt(f"received signal {signum}")
+        def request_snapshot(signum, frame):
+            self.requested = True
+        signal.signal(signal.SIGTERM, stop)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, request_snapshot)
+
+    def due(self, completed):
+        """Periodic trigger after a completed page visit; SIGUSR1 requests are polled via `requested`."""
+        return completed > 0 and completed % self.every == 0
+
+    def save(self, state):
+        temp_path = self.file_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({**state, "saved_at": int(time.time())}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.file_path)
+            self.requested = False
+        except IOError as e:
+            print(f"!!! Could not write checkpoint {self.file_path}: {e} !!!")
+
+    def load(self):
+        if not os.path.exists(self.file_path):
+            print(f"No checkpoint found at '{self.file_path}'. Starting a fresh run.")
+            return None
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Could not read checkpoint {self.file_path}: {e}. Starting a fresh run.")
+            return None
+        print(f"Resuming from checkpoint saved at {time.ctime(state.get('saved_at', 0))}.")
+        return state
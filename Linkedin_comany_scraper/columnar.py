@@ -0,0 +1,75 @@
+import os
+import argparse
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from normalize import load_normalized
+
+# --- Configuration ---
+PARQUET_FILE = "companies.parquet"
+ARROW_FILE = "companies.arrow"
+DICTIONARY_COLUMNS = ["industry", "company_size", "headquarters", "hq_city", "hq_region", "hq_country"]
+
+#<editor-fold desc="Export">
+
+def build_table(data_file):
+    """Converts the normalized company table into Arrow, dictionary-encoding low-cardinality columns."""
+    frame = load_normalized(data_file)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    for column in DICTIONARY_COLUMNS:
+        index = table.schema.get_field_index(column)
+        table = table.set_column(index, column, pc.dictionary_encode(table[column].cast(pa.string())))
+    return table
+
+def export_columnar(data_file, parquet_path=PARQUET_FILE, arrow_path=ARROW_FILE):
+    """Writes a compressed Parquet file for interchange and an uncompressed Arrow IPC file for mmap reads."""
+    table = build_table(data_file)
+    pq.write_table(table, parquet_path + ".tmp", compression="zstd", use_dictionary=DICTIONARY_COLUMNS)
+    os.replace(parquet_path + ".tmp", parquet_path)
+    with pa.OSFile(arrow_path + ".tmp", "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(arrow_path + ".tmp", arrow_path)
+    print(f"Exported {table.num_rows} companies to '{parquet_path}' and '{arrow_path}'.")
+    return table.num_rows
+#</editor-fold>
+
+#<editor-fold desc="Memory-Mapped Readers">
+
+def open_companies(columns=None, arrow_path=ARROW_FILE):
+    """Memory-maps the Arrow IPC file; only the pages of the selected columns are ever read."""
+    reader = ipc.open_file(pa.memory_map(arrow_path, "r"))
+    table = reader.read_all()
+    return table.select(columns) if columns else table
+
+def read_parquet_columns(columns, parquet_path=PARQUET_FILE):
+    return pq.read_table(parquet_path, columns=columns, memory_map=True)
+
+def group_count(column, arrow_path=ARROW_FILE):
+    """Company counts per value of `column`, largest first."""
+    table = open_companies([column], arrow_path)
+    counts = table.group_by(column).aggregate([([], "count_all")])
+    return counts.sort_by([("count_all", "descending")])
+
+def group_stats(by, value_column, arrow_path=ARROW_FILE):
+    """Count, mean and sum of a numeric column per group, e.g. followers_count by industry."""
+    table = open_companies([by, value_column], arrow_path)
+    stats = table.group_by(by).aggregate([(value_column, "count"), (value_column, "mean"), (value_column, "sum")])
+    return stats.sort_by([(f"{value_column}_sum", "descending")])
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar export and memory-mapped queries over the company corpus.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Write companies.parquet and companies.arrow.")
+    export_parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    groupby_parser = subparsers.add_parser("groupby", help="Group the exported companies by a column.")
+    groupby_parser.add_argument("column", choices=DICTIONARY_COLUMNS)
+    groupby_parser.add_argument("--value", help="Numeric column to aggregate, e.g. followers_count.")
+    args = parser.parse_args()
+    if args.command == "export":
+        export_columnar(args.data_file)
+    else:
+        result = group_stats(args.column, args.value) if args.value else group_count(args.column)
+        print(result.to_pandas().to_string(index=False))
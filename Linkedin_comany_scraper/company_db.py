@@ -0,0 +1,134 @@
+import json
+import sqlite3
+import argparse
+from record_store import iter_latest_records
+
+# --- Configuration ---
+COMMIT_EVERY = 25  # records per transaction while scraping (also committed at each checkpoint and on close); bulk imports use a single transaction
+RECORD_FIELDS = ["followers", "overview", "website", "industry", "company_size", "headquarters", "job_openings_text", "hq_city", "hq_region", "hq_country"]
+INDEXED_FIELDS = ["industry", "company_size", "hq_country", "hq_region"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS companies (
+    company_slug TEXT PRIMARY KEY,
+    {", ".join(f"{field} TEXT" for field in RECORD_FIELDS)},
+    extra TEXT
+);
+"""
+
+INDEX_SCHEMA = "\n".join(f"CREATE INDEX IF NOT EXISTS idx_companies_{field} ON companies({field});" for field in INDEXED_FIELDS)
+
+UPSERT_SQL = f"""
+INSERT INTO companies (company_slug, {", ".join(RECORD_FIELDS)}, extra)
+VALUES ({", ".join("?" for _ in range(len(RECORD_FIELDS) + 2))})
+ON CONFLICT(company_slug) DO UPDATE SET
+    {", ".join(f"{field} = excluded.{field}" for field in RECORD_FIELDS + ["extra"])}
+"""
+
+#<editor-fold desc="Row Conversion Helpers">
+
+def record_to_row(record):
+    extra = {k: v for k, v in record.items() if k != "company_slug" and k not in RECORD_FIELDS}
+    return (record["company_slug"], *(record.get(field) for field in RECORD_FIELDS), json.dumps(extra, ensure_ascii=False) if extra else None)
+
+def row_to_record(row):
+    """Rebuilds the JSON record shape, omitting fields the scraper never found."""
+    record = {"company_slug": row["company_slug"]}
+    for field in RECORD_FIELDS:
+        if row[field] is not None: record[field] = row[field]
+    if row["extra"]: record.update(json.loads(row["extra"]))
+    return record
+#</editor-fold>
+
+#<editor-fold desc="SQLite Company Store">
+
+class SqliteCompanyStore:
+    """SQLite-backed company store with the same `in` / `append` / `close` interface as `JsonlRecordStore`.
+
+    Slug membership checks are primary-key lookups, so nothing proportional to the corpus
+    is held in memory during a run.
+    """
+
+    def __init__(self, db_path, commit_every=COMMIT_EVERY):
+        self.db_path = db_path
+        self.commit_every = commit_every
+        self._pending = 0
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._add_missing_columns()
+        self.conn.executescript(INDEX_SCHEMA)
+
+    def _add_missing_columns(self):
+        """Databases created before a field joined RECORD_FIELDS get the column added in place."""
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(companies)")}
+        for field in RECORD_FIELDS:
+            if field not in existing: self.conn.execute(f"ALTER TABLE companies ADD COLUMN {field} TEXT")
+
+    def __contains__(self, slug):
+        return self.conn.execute("SELECT 1 FROM companies WHERE company_slug = ?", (slug,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+    def append(self, record):
+        if not record.get("company_slug"): raise ValueError("Record has no 'company_slug'.")
+        self.conn.execute(UPSERT_SQL, record_to_row(record))
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def append_many(self, records):
+        """Upserts an iterable of records in a single transaction."""
+        with self.conn:
+            cursor = self.conn.executemany(UPSERT_SQL, (record_to_row(r) for r in records if r.get("company_slug")))
+        return cursor.rowcount
+
+    def commit(self):
+        self.conn.commit()
+        self._pending = 0
+
+    def get(self, slug):
+        row = self.conn.execute("SELECT * FROM companies WHERE company_slug = ?", (slug,)).fetchone()
+        return row_to_record(row) if row else None
+
+    def find(self, industry=None, company_size=None, hq_country=None, hq_region=None, limit=100, offset=0):
+        clauses, params = [], []
+        for field, value in (("industry", industry), ("company_size", company_size), ("hq_country", hq_country), ("hq_region", hq_region)):
+            if value is not None: clauses.append(f"{field} = ?"); params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(f"SELECT * FROM companies {where} ORDER BY company_slug LIMIT ? OFFSET ?", (*params, limit, offset))
+        return [row_to_record(row) for row in rows]
+
+    def count_by(self, field):
+        """Company counts per value of an indexed field, largest first."""
+        if field not in INDEXED_FIELDS: raise ValueError(f"'{field}' is not an indexed field.")
+        return [tuple(row) for row in self.conn.execute(f"SELECT {field}, COUNT(*) FROM companies GROUP BY {field} ORDER BY COUNT(*) DESC")]
+
+    def iter_records(self):
+        for row in self.conn.execute("SELECT * FROM companies ORDER BY company_slug"):
+            yield row_to_record(row)
+
+    def close(self):
+        if self.conn:
+            self.commit()
+            self.conn.close()
+            self.conn = None
+#</editor-fold>
+
+def import_records(source_path, db_path):
+    """Bulk-loads a legacy JSON array or JSONL store into the SQLite database."""
+    store = SqliteCompanyStore(db_path)
+    count = store.append_many(iter_latest_records(source_path))
+    print(f"Imported {count} companies from '{source_path}' into '{db_path}'.")
+    store.close()
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import scraped companies into the SQLite company database.")
+    parser.add_argument("source_path", nargs="?", default="scraped_data.jsonl")
+    parser.add_argument("db_path", nargs="?", default="companies.db")
+    args = parser.parse_args()
+    import_records(args.source_path, args.db_path)
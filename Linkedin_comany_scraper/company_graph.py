@@ -0,0 +1,128 @@
+import os
+import json
+import argparse
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from record_store import iter_latest_records
+from edge_log import EDGE_LOG_FILE
+
+# --- Configuration ---
+GRAPH_FILE = "company_graph.npz"
+GRAPH_SLUGS_FILE = "company_graph_slugs.json"
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-9
+PAGERANK_MAX_ITERATIONS = 100
+
+#<editor-fold desc="CSR Graph Construction">
+
+def build_graph(edge_log_path=EDGE_LOG_FILE):
+    """Reads the edge log into a deduplicated CSR adjacency matrix with integer slug IDs."""
+    slug_ids, slugs = {}, []
+    sources, targets = [], []
+    with open(edge_log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) != 2: continue
+            for slug in parts:
+                if slug not in slug_ids:
+                    slug_ids[slug] = len(slugs)
+                    slugs.append(slug)
+            sources.append(slug_ids[parts[0]])
+            targets.append(slug_ids[parts[1]])
+    n = len(slugs)
+    adjacency = sp.csr_matrix((np.ones(len(sources), dtype=np.float32), (np.array(sources, dtype=np.int32), np.array(targets, dtype=np.int32))), shape=(n, n))
+    adjacency.sum_duplicates()
+    adjacency.data[:] = 1.0
+    return adjacency, slugs
+
+def save_graph(adjacency, slugs, graph_path=GRAPH_FILE, slugs_path=GRAPH_SLUGS_FILE):
+    sp.save_npz(graph_path, adjacency)
+    with open(slugs_path, 'w', encoding='utf-8') as f:
+        json.dump(slugs, f)
+
+def load_graph(graph_path=GRAPH_FILE, slugs_path=GRAPH_SLUGS_FILE, edge_log_path=EDGE_LOG_FILE):
+    """Loads the saved CSR graph, rebuilding it first if the edge log is newer."""
+    if not os.path.exists(graph_path) or os.path.getmtime(edge_log_path) > os.path.getmtime(graph_path):
+        adjacency, slugs = build_graph(edge_log_path)
+        save_graph(adjacency, slugs, graph_path, slugs_path)
+        return adjacency, slugs
+    with open(slugs_path, 'r', encoding='utf-8') as f:
+        slugs = json.load(f)
+    return sp.load_npz(graph_path).tocsr(), slugs
+#</editor-fold>
+
+#<editor-fold desc="Analytics">
+
+def pagerank(adjacency, damping=PAGERANK_DAMPING, tolerance=PAGERANK_TOLERANCE, max_iterations=PAGERANK_MAX_ITERATIONS):
+    """Power iteration on the row-normalized adjacency; dangling nodes spread rank uniformly."""
+    n = adjacency.shape[0]
+    if n == 0: return np.zeros(0)
+    out_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inverse_degree = np.divide(1.0, out_degree, out=np.zeros_like(out_degree), where=~dangling)
+    transition_t = (sp.diags(inverse_degree) @ adjacency).T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        new_rank = damping * (transition_t @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(new_rank - rank).sum() < tolerance:
+            return new_rank
+        rank = new_rank
+    return rank
+
+def weak_components(adjacency):
+    """Number of weakly connected components and the component label of each node."""
+    return connected_components(adjacency, directed=True, connection="weak")
+
+def industry_link_density(adjacency, slugs, industries_by_slug):
+    """Links between each pair of industries divided by the possible links between them.
+
+    Only nodes with a known industry are counted. Returns (industry_names, density, link_counts).
+    """
+    names = sorted({industry for industry in industries_by_slug.values() if industry})
+    name_index = {name: i for i, name in enumerate(names)}
+    node_industry = np.array([name_index.get(industries_by_slug.get(slug), -1) for slug in slugs], dtype=np.int32)
+    coo = adjacency.tocoo()
+    known = (node_industry[coo.row] >= 0) & (node_industry[coo.col] >= 0)
+    k = len(names)
+    counts = sp.coo_matrix((np.ones(known.sum()), (node_industry[coo.row[known]], node_industry[coo.col[known]])), shape=(k, k)).toarray()
+    sizes = np.bincount(node_industry[node_industry >= 0], minlength=k).astype(float)
+    possible = np.outer(sizes, sizes) - np.diag(sizes)
+    density = np.divide(counts, possible, out=np.zeros_like(counts), where=possible > 0)
+    return names, density, counts
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analytics over the company co-occurrence graph.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="Rebuild the CSR graph from the edge log.")
+    pagerank_parser = subparsers.add_parser("pagerank", help="Rank companies by PageRank.")
+    pagerank_parser.add_argument("--top", type=int, default=20)
+    subparsers.add_parser("components", help="Summarize weakly connected components.")
+    density_parser = subparsers.add_parser("density", help="Industry-to-industry link density.")
+    density_parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    density_parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        graph, graph_slugs = build_graph()
+        save_graph(graph, graph_slugs)
+        print(f"Built graph with {graph.shape[0]} companies and {graph.nnz} links.")
+    elif args.command == "pagerank":
+        graph, graph_slugs = load_graph()
+        ranks = pagerank(graph)
+        for node in np.argsort(-ranks)[:args.top]:
+            print(f"{graph_slugs[node]:<48}{ranks[node]:.6f}")
+    elif args.command == "components":
+        graph, graph_slugs = load_graph()
+        count, labels = weak_components(graph)
+        sizes = np.bincount(labels)
+        print(f"{count} weakly connected components; largest has {sizes.max() if count else 0} of {graph.shape[0]} companies.")
+    else:
+        graph, graph_slugs = load_graph()
+        industries = {r["company_slug"]: r.get("industry") for r in iter_latest_records(args.data_file) if r.get("company_slug")}
+        industry_names, link_density, link_counts = industry_link_density(graph, graph_slugs, industries)
+        pairs = sorted(((link_density[i, j], link_counts[i, j], industry_names[i], industry_names[j])
+                        for i, j in zip(*np.nonzero(link_counts))), reverse=True)
+        for value, links, source, target in pairs[:args.top]:
+            print(f"{source[:36]:<38}-> {target[:36]:<38}{int(links):>6} links  density {value:.4f}")
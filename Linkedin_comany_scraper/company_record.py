@@ -0,0 +1,55 @@
+import sys
+
+# --- Configuration ---
+CATEGORICAL_FIELDS = ["industry", "company_size", "headquarters", "hq_city", "hq_region", "hq_country"]  # small vocabularies, interned
+FIELD_ORDER = ["company_slug", "followers", "overview", "website", "industry", "company_size", "headquarters",
+               "job_openings_text", "hq_city", "hq_region", "hq_country", "scraped_at", "content_hash"]
+KNOWN_FIELDS = frozenset(FIELD_ORDER)
+
+class CompanyRecord:
+    """Slotted in-memory form of one company record.
+
+    Slots drop the per-record dict and its key strings, and categorical values are
+    `sys.intern`ed so every record in the same industry or size band points at one shared
+    string. A field the scraper did not find is None here and absent from `to_dict()`;
+    keys outside FIELD_ORDER, and known keys explicitly set to None, survive the round
+    trip in `extra`.
+    """
+
+    __slots__ = FIELD_ORDER + ["extra"]
+
+    def __init__(self, company_slug, extra=None, **fields):
+        self.company_slug = company_slug
+        for field in FIELD_ORDER[1:]:
+            value = fields.pop(field, None)
+            if field in CATEGORICAL_FIELDS and isinstance(value, str): value = sys.intern(value)
+            setattr(self, field, value)
+        if fields: raise TypeError(f"Unknown record fields {sorted(fields)}; pass them in 'extra'.")
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, record):
+        known = {k: v for k, v in record.items() if k in KNOWN_FIELDS and v is not None}
+        extra = {k: v for k, v in record.items() if k not in known}
+        return cls(extra=extra, **known)
+
+    def to_dict(self):
+        record = {}
+        for field in FIELD_ORDER:
+            value = getattr(self, field)
+            if value is not None: record[field] = value
+        if self.extra: record.update(self.extra)
+        return record
+
+    def get(self, field, default=None):
+        """Dict-style read so code written against record dicts keeps working."""
+        if field in KNOWN_FIELDS:
+            value = getattr(self, field)
+            return default if value is None else value
+        return (self.extra or {}).get(field, default)
+
+    def __eq__(self, other):
+        return isinstance(other, CompanyRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"CompanyRecord({self.company_slug!r}, industry={self.industry!r})"
@@ -0,0 +1,161 @@
+import re
+import json
+import zlib
+import argparse
+from collections import defaultdict
+from urllib.parse import urlparse
+import numpy as np
+from record_store import iter_latest_records
+from field_patterns import parse_follower_count
+
+# --- Configuration ---
+CLUSTERS_FILE = "duplicate_clusters.json"
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16  # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+SIMILARITY_THRESHOLD = 0.7
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 5  # overviews shorter than this are too generic to compare
+MERSENNE_PRIME = (1 << 31) - 1
+SEED = 1729
+
+MULTI_PART_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "com.au", "net.au", "org.au", "co.in", "net.in", "org.in", "firm.in",
+    "co.jp", "co.kr", "co.nz", "com.br", "com.cn", "com.mx", "com.sg", "com.hk", "com.tr", "co.za", "com.my", "co.id", "gc.ca",
+}
+SHARED_HOST_DOMAINS = {
+    "linkedin.com", "facebook.com", "instagram.com", "twitter.com", "x.com", "youtube.com", "linktr.ee",
+    "google.com", "sites.google.com", "wixsite.com", "wordpress.com", "blogspot.com", "medium.com", "github.io",
+}
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+#<editor-fold desc="Domain Normalization">
+
+def registrable_domain(website):
+    """'https://www.News.Microsoft.com/' -> 'microsoft.com'; 'http://shop.example.co.uk' -> 'example.co.uk'."""
+    if not website: return None
+    website = website.strip().lower()
+    if "://" not in website: website = "http://" + website
+    host = urlparse(website).hostname
+    if not host or '.' not in host: return None
+    labels = host.split('.')
+    keep = 3 if '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES and len(labels) >= 3 else 2
+    return '.'.join(labels[-keep:])
+#</editor-fold>
+
+#<editor-fold desc="MinHash and LSH">
+
+def shingle_hashes(text):
+    words = WORD_PATTERN.findall((text or "").lower())
+    shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.int64, count=len(shingles))
+
+def make_permutations(num_permutations=NUM_PERMUTATIONS, seed=SEED):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=num_permutations, dtype=np.int64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_permutations, dtype=np.int64)
+    return a, b
+
+def minhash_signature(hashes, a, b):
+    """Min over shingles of (a*x + b) mod p for every permutation, computed as one array op."""
+    x = hashes % MERSENNE_PRIME
+    return ((a[:, None] * x[None, :] + b[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+def lsh_candidate_pairs(signatures, bands=LSH_BANDS):
+    """Pairs of row indices whose signatures agree on at least one full band."""
+    rows_per_band = signatures.shape[1] // bands
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        band_slice = np.ascontiguousarray(signatures[:, band * rows_per_band:(band + 1) * rows_per_band])
+        for row, key in enumerate(band_slice):
+            buckets[key.tobytes()].append(row)
+        for members in buckets.values():
+            if len(members) < 2: continue
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pairs.add((members[i], members[j]))
+    return pairs
+#</editor-fold>
+
+#<editor-fold desc="Clustering">
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b: self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+def _slug_matches_domain(record):
+    domain = registrable_domain(record.get("website"))
+    return bool(domain) and record["company_slug"].replace('-', '') == domain.split('.')[0].replace('-', '')
+
+def canonical_slug(records):
+    """A slug named after its own website domain wins, then the most complete record,
+    then the most followers, then the shortest slug."""
+    best = max(records, key=lambda r: (_slug_matches_domain(r), sum(1 for v in r.values() if v),
+                                       parse_follower_count(r.get("followers")) or 0, -len(r["company_slug"]), r["company_slug"]))
+    return best["company_slug"]
+
+def find_duplicate_clusters(records, threshold=SIMILARITY_THRESHOLD):
+    records = [r for r in records if r.get("company_slug")]
+    union_find = UnionFind(len(records))
+    reasons = defaultdict(set)
+
+    by_domain = defaultdict(list)
+    for row, record in enumerate(records):
+        domain = registrable_domain(record.get("website"))
+        if domain and domain not in SHARED_HOST_DOMAINS: by_domain[domain].append(row)
+    for domain, rows in by_domain.items():
+        for row in rows[1:]:
+            union_find.union(rows[0], row)
+            reasons[rows[0]].add(f"domain:{domain}")
+
+    a, b = make_permutations()
+    comparable, signatures = [], []
+    for row, record in enumerate(records):
+        hashes = shingle_hashes(record.get("overview"))
+        if len(hashes) < MIN_SHINGLES: continue
+        comparable.append(row)
+        signatures.append(minhash_signature(hashes, a, b))
+    if signatures:
+        signature_matrix = np.vstack(signatures)
+        for i, j in lsh_candidate_pairs(signature_matrix):
+            similarity = float(np.mean(signature_matrix[i] == signature_matrix[j]))
+            if similarity >= threshold:
+                union_find.union(comparable[i], comparable[j])
+                reasons[comparable[i]].add(f"overview:{similarity:.2f}")
+
+    groups = defaultdict(list)
+    for row in range(len(records)):
+        groups[union_find.find(row)].append(row)
+    clusters = []
+    for rows in groups.values():
+        if len(rows) < 2: continue
+        members = [records[row] for row in rows]
+        clusters.append({
+            "canonical_slug": canonical_slug(members),
+            "members": sorted(r["company_slug"] for r in members),
+            "evidence": sorted({reason for row in rows for reason in reasons[row]}),
+        })
+    return sorted(clusters, key=lambda c: (-len(c["members"]), c["canonical_slug"]))
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find companies scraped under several slugs.")
+    parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    parser.add_argument("--output", default=CLUSTERS_FILE)
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    args = parser.parse_args()
+    found_clusters = find_duplicate_clusters(iter_latest_records(args.data_file), args.threshold)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(found_clusters, f, indent=2, ensure_ascii=False)
+    duplicates = sum(len(c["members"]) - 1 for c in found_clusters)
+    print(f"Found {len(found_clusters)} duplicate clusters ({duplicates} redundant slugs). Written to '{args.output}'.")
@@ -0,0 +1,22 @@
+# --- Configuration ---
+EDGE_LOG_FILE = "company_edges.tsv"
+
+class EdgeLog:
+    """Append-only `source<TAB>target` log of company-to-company links seen on about pages.
+
+    Kept free of numpy/scipy so the scraper can record links without the analytics stack;
+    `company_graph.py` builds the sparse graph from this file offline.
+    """
+
+    def __init__(self, file_path=EDGE_LOG_FILE):
+        self.file_path = file_path
+        self._file = open(file_path, 'a', encoding='utf-8')
+
+    def append(self, source_slug, target_slugs):
+        lines = [f"{source_slug}\t{target}\n" for target in target_slugs if target != source_slug]
+        if not lines: return
+        self._file.writelines(lines)
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed: self._file.close()
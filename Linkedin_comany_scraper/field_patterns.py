@@ -0,0 +1,17 @@
+import re
+
+# --- Configuration ---
+FOLLOWERS_PATTERN = r'(?P<number>\d[\d,]*(?:\.\d+)?)\s*(?P<suffix>[KMB])?'
+COMPANY_SIZE_PATTERN = r'(?P<lower>\d[\d,]*)\s*(?:-\s*(?P<upper>\d[\d,]*)|(?P<open>\+))?'
+JOB_OPENINGS_PATTERN = r'(?P<count>\d[\d,]*)\s+(?:job opening|result)'
+SUFFIX_MULTIPLIERS = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+FOLLOWERS_RE = re.compile(FOLLOWERS_PATTERN)
+
+def parse_follower_count(text):
+    """'5M followers' / '382K followers' / '1,234 followers' -> integer follower count, None if unparseable.
+
+    Scalar counterpart of `normalize.parse_followers`, for code that must not import pandas.
+    """
+    match = FOLLOWERS_RE.search(text or "")
+    if not match: return None
+    return round(float(match.group("number").replace(',', '')) * SUFFIX_MULTIPLIERS.get(match.group("suffix"), 1))
@@ -0,0 +1,73 @@
+import json
+import os
+from collections import deque
+
+class DiscoveryFrontier:
+    """Ordered queue of slugs waiting to be scraped, with O(1) dedup, pops and re-queues.
+
+    Keeps the discovery queue's LIFO-front behaviour: newly discovered slugs and re-queued
+    failures go to the front, while seeds drain from the front as well.
+    """
+
+    def __init__(self, file_path=None):
+        self.file_path = file_path
+        self._queue = deque()
+        self._members = set()
+        if file_path and os.path.exists(file_path):
+            self.load()
+
+    def __contains__(self, slug):
+        return slug in self._members
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __bool__(self):
+        return bool(self._queue)
+
+    def __iter__(self):
+        return iter(self._queue)
+
+    def push_front_many(self, slugs):
+        """Places `slugs` at the front in their given order, skipping any already queued."""
+        new_slugs = [s for s in dict.fromkeys(slugs) if s not in self._members]
+        self._queue.extendleft(reversed(new_slugs))
+        self._members.update(new_slugs)
+        return len(new_slugs)
+
+    def requeue(self, slug):
+        """Puts a slug back at the front, e.g. after a failed scrape."""
+        if slug in self._members:
+            self._queue.remove(slug)
+        self._queue.appendleft(slug)
+        self._members.add(slug)
+
+    def pop(self):
+        slug = self._queue.popleft()
+        self._members.discard(slug)
+        return slug
+
+    def load(self):
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                slugs = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Could not read frontier file {self.file_path}: {e}")
+            return
+        self._queue.clear()
+        self._members.clear()
+        self.push_front_many(slugs)
+        print(f"Restored {len(self._queue)} queued slugs from '{self.file_path}'.")
+
+    def save(self):
+        """Atomically writes the queue to `file_path` (temp file + rename)."""
+        if not self.file_path: return
+        temp_path = self.file_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._queue), f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.file_path)
+        except IOError as e:
+            print(f"!!! Could not save frontier to {self.file_path}: {e} !!!")
@@ -4,6 +4,7 @@ import os
 import random
 import re
 import zipfile
+import argparse
 from itertools import cycle
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -16,20 +17,50 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+from record_store import JsonlRecordStore, migrate_json_array, iter_latest_records
+from company_db import SqliteCompanyStore
+from frontier import DiscoveryFrontier
+from page_archive import PageArchive
+from search_index import CompanySearchIndex
+from refresh_scheduler import build_scheduler, stamp_record
+from edge_log import EdgeLog
+from checkpoint import CheckpointManager
+from location import LocationResolver, add_location
+from metrics import timed, configure_metrics, set_metrics_context, close_metrics, RECORDER
 
 # --- Configuration ---
 MAX_NEW_COMPANIES = 50000
 COMPANIES_PER_ACCOUNT_RANGE =(2500,5000)
 MAX_SEARCH_PAGES_PER_INDUSTRY = 50
+STORAGE_BACKEND = "jsonl"  # "jsonl" or "sqlite"
+CHECKPOINT_EVERY = 25  # page visits between crawl-state checkpoints
+ARCHIVE_PAGES = True  # keep compressed about/jobs page HTML for offline re-extraction
+INDEX_OVERVIEWS = True  # add each scraped company to the full-text search index
+TRACK_EDGES = True  # log company-to-company links from about pages for company_graph.py
+REFRESH_EVERY = 5  # one due re-fetch of a stored company per this many page visits; 0 disables refreshing
+EMBED_OVERVIEWS = True  # fold each scraped overview into the similar-companies index once it has been built
+TRACK_TIMESERIES = True  # append followers / job openings to the per-company history on every visit
+NORMALIZE_LOCATIONS = True  # add hq_city / hq_region / hq_country resolved from the bundled gazetteer
 
 # --- File Paths ---
 CREDENTIALS_FILE = "credentials.json"
 PROXIES_FILE = "proxies.txt"
-DATA_FILE = "scraped_data.json"
+DATA_FILE = "scraped_data.jsonl"
+LEGACY_DATA_FILE = "scraped_data.json"
+DB_FILE = "companies.db"
+FRONTIER_FILE = "discovery_queue.json"
+ARCHIVE_DIR = "page_archive"
+METRICS_FILE = "metrics.jsonl"
+SEARCH_DB_FILE = "company_search.db"
+REFRESH_STATE_FILE = "refresh_state.json"
+EDGE_LOG_FILE = "company_edges.tsv"
+CHECKPOINT_FILE = "crawl_checkpoint.json"
+TIMESERIES_DIR = "company_timeseries"
 BANNED_ACCOUNTS_FILE = "banned_accounts.json"
 BAD_PROXIES_FILE = "bad_proxies.txt"
 
 WAIT_TIME = 30
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
 
 PRIORITY_INDUSTRIES = [
     "Software Development", "IT Services and IT Consulting", "Technology, Information and Internet",
@@ -56,14 +87,18 @@ def load_blacklist(file_path, is_json=False):
         return set()
 
 def load_existing_data(file_path):
-    if not os.path.exists(file_path):
-        return [], set()
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data, {item.get('company_slug') for item in data if item.get('company_slug')}
-    except (json.JSONDecodeError, IOError):
-        return [], set()
+    if STORAGE_BACKEND == "sqlite":
+        store = SqliteCompanyStore(DB_FILE)
+        if len(store) == 0:
+            source_path = next((p for p in (file_path, LEGACY_DATA_FILE) if os.path.exists(p)), None)
+            if source_path: store.append_many(iter_latest_records(source_path))
+        print(f"Loaded {len(store)} previously scraped companies from '{DB_FILE}'.")
+        return store
+    if not os.path.exists(file_path) and os.path.exists(LEGACY_DATA_FILE):
+        migrate_json_array(LEGACY_DATA_FILE, file_path)
+    store = JsonlRecordStore(file_path)
+    print(f"Loaded {len(store)} previously scraped companies from '{file_path}'.")
+    return store
 
 def quarantine_asset(asset, file_path, is_json=False):
     print(f"--- QUARANTINING ASSET -> {file_path} ---")
@@ -127,6 +162,7 @@ def human_like_click(driver, element):
         print(f"Could not perform human-like click, falling back to JS click. Error: {e}")
         driver.execute_script("arguments[0].click();", element)
 
+@timed("human_like_scroll")
 def human_like_scroll(driver):
     try:
         total_height = driver.execute_script("return document.body.scrollHeight")
@@ -145,6 +181,7 @@ def human_like_scroll(driver):
     except Exception as e:
         print(f"Could not perform human-like scroll: {e}")
 
+@timed("perform_curiosity_click")
 def perform_curiosity_click(driver, wait):
     if random.random() > 0.15: return
     print("--- Performing a 'curiosity' click... ---")
@@ -161,48 +198,54 @@ def perform_curiosity_click(driver, wait):
 
 #<editor-fold desc="Core Scraping and Discovery Functions"> 
 
-def scrape_company_data(driver, wait, company_slug):
+@timed("scrape_company_data")
+def scrape_company_data(driver, wait, company_slug, page_archive=None):
     scraped_data = {"company_slug": company_slug}
-    about_url = f"https://www.linkedin.com/company/{company_slug}/about/"
+    about_url = f"{LINKEDIN_BASE_URL}/company/{company_slug}/about/"
     print(f"\n--- Scraping Company: {company_slug} ---")
-    driver.get(about_url)
+    with timed("driver.get.about"): driver.get(about_url)
     check_for_session_errors(driver)
     human_like_scroll(driver)
-    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".org-top-card")))
+    with timed("wait.top_card"): wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".org-top-card")))
     try:
-        followers_element = wait.until(EC.presence_of_element_located((By.XPATH, "//a[contains(@href, '/followers/')] ")))
+        with timed("wait.followers"): followers_element = wait.until(EC.presence_of_element_located((By.XPATH, "//a[contains(@href, '/followers/')] ")))
         scraped_data["followers"] = followers_element.text.strip()
     except TimeoutException: pass
-    wait.until(EC.presence_of_element_located((By.TAG_NAME, "dl")))
+    with timed("wait.details_list"): wait.until(EC.presence_of_element_located((By.TAG_NAME, "dl")))
     try:
-        description_element = wait.until(EC.presence_of_element_located((By.XPATH, "//h2[normalize-space(.)='Overview']/following-sibling::p")))
+        with timed("wait.overview"): description_element = wait.until(EC.presence_of_element_located((By.XPATH, "//h2[normalize-space(.)='Overview']/following-sibling::p")))
         scraped_data["overview"] = description_element.text.strip()
     except TimeoutException: pass
     details_to_scrape = {"website": "Website", "industry": "Industry", "company_size": "Company size", "headquarters": "Headquarters"}
     for key, label in details_to_scrape.items():
         try:
-            element = wait.until(EC.presence_of_element_located((By.XPATH, f"//dt[normalize-space(.)='{label}']/following-sibling::dd[1]")))
+            with timed(f"wait.{key}"): element = wait.until(EC.presence_of_element_located((By.XPATH, f"//dt[normalize-space(.)='{label}']/following-sibling::dd[1]")))
             scraped_data[key] = element.text.strip().split('\n')[0]
         except TimeoutException: pass
-    time.sleep(random.uniform(2.5, 5.5))
-    jobs_url = f"https://www.linkedin.com/company/{company_slug}/jobs/"
-    driver.get(jobs_url)
+    if page_archive:
+        with timed("page_archive.about"): page_archive.put(company_slug, "about", driver.page_source)
+    with timed("sleep.between_pages"): time.sleep(random.uniform(2.5, 5.5))
+    jobs_url = f"{LINKEDIN_BASE_URL}/company/{company_slug}/jobs/"
+    with timed("driver.get.jobs"): driver.get(jobs_url)
     check_for_session_errors(driver)
     try:
-        job_count_element = wait.until(EC.presence_of_element_located((By.XPATH, "//*[self::h1 or self::h2 or self::h3 or self::h4][contains(., 'job') or contains(., 'result')]")))
+        with timed("wait.job_openings"): job_count_element = wait.until(EC.presence_of_element_located((By.XPATH, "//*[self::h1 or self::h2 or self::h3 or self::h4][contains(., 'job') or contains(., 'result')]")))
         scraped_data['job_openings_text'] = job_count_element.text.strip()
     except TimeoutException: pass
-    driver.get(about_url)
-    wait.until(EC.presence_of_element_located((By.TAG_NAME, "dl")))
+    if page_archive:
+        with timed("page_archive.jobs"): page_archive.put(company_slug, "jobs", driver.page_source)
+    with timed("driver.get.about_return"): driver.get(about_url)
+    with timed("wait.details_list"): wait.until(EC.presence_of_element_located((By.TAG_NAME, "dl")))
     return scraped_data
 
+@timed("find_first_new_company_on_page")
 def find_first_new_company_on_page(driver, wait, search_term, page_num, scraped_slugs):
     print(f"\n--- Searching for '{search_term}' on page {page_num}... ---")
-    search_url = f"https://www.linkedin.com/search/results/companies/?keywords={search_term}&page={page_num}"
-    driver.get(search_url)
+    search_url = f"{LINKEDIN_BASE_URL}/search/results/companies/?keywords={search_term}&page={page_num}"
+    with timed("driver.get.search"): driver.get(search_url)
     check_for_session_errors(driver)
     try:
-        wait.until(EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'search-results-container')]")))
+        with timed("wait.search_results"): wait.until(EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'search-results-container')]")))
         human_like_scroll(driver)
     except TimeoutException:
         print(f"Timed out waiting for search results container to load.")
@@ -235,31 +278,41 @@ def _extract_slug_from_href(href):
     match = re.search(r'/(?:company|showcase)/([^/?]+)', href)
     return match.group(1) if match else None
 
-def discover_new_companies(driver, wait, scraped_slugs, discovery_queue, current_slug):
+@timed("discover_new_companies")
+def discover_new_companies(driver, wait, scraped_slugs, discovery_queue, current_slug, edge_log=None):
     print(f"\n--- Discovering new companies from '{current_slug}' ---")
     new_slugs_for_queue = set()
+    linked_slugs = set()
     try:
         all_links = driver.find_elements(By.TAG_NAME, "a")
         for link in all_links:
             try:
                 href = link.get_attribute('href')
                 slug = _extract_slug_from_href(href)
-                if slug and slug != current_slug and slug not in scraped_slugs and slug not in discovery_queue:
-                    new_slugs_for_queue.add(slug)
+                if slug and slug != current_slug:
+                    linked_slugs.add(slug)
+                    if slug not in scraped_slugs and slug not in discovery_queue:
+                        new_slugs_for_queue.add(slug)
             except Exception: continue
+        if edge_log: edge_log.append(current_slug, sorted(linked_slugs))
         if new_slugs_for_queue:
-            slug_list = list(new_slugs_for_queue)
-            discovery_queue[0:0] = slug_list
-            print(f"+++ Added {len(slug_list)} new slugs to the front of the discovery queue. +++")
+            added = discovery_queue.push_front_many(new_slugs_for_queue)
+            print(f"+++ Added {added} new slugs to the front of the discovery queue. +++")
         else:
             print("No new, unique companies found on this page.")
     except (WebDriverException, TimeoutException) as e:
         print(f"An error occurred during company discovery: {e}")
         if isinstance(e, WebDriverException): raise SessionInvalidException(f"WebDriver error during discovery: {e}")
+
+def requeue_slug(slug, is_refresh, discovery_queue, refresh_scheduler):
+    """Puts a slug whose scrape failed back where it came from."""
+    if is_refresh: refresh_scheduler.requeue(slug)
+    else: discovery_queue.requeue(slug)
 #</editor-fold>
 
 #<editor-fold desc="Session Management Functions"> 
 
+@timed("check_for_session_errors")
 def check_for_session_errors(driver):
     page_title = driver.title.lower()
     if "security check" in page_title or "prove you're human" in driver.page_source.lower():
@@ -274,6 +327,7 @@ def is_logged_in(driver):
     except (NoSuchElementException, TimeoutException):
         return False
 
+@timed("login_and_setup_driver")
 def login_and_setup_driver(credential, proxy=None):
     print(f"\n---\nAttempting to log in with account: {credential['username']}")
     if proxy: print(f"Using proxy: {proxy.split('@')[-1]}")
@@ -376,21 +430,51 @@ def login_and_setup_driver(credential, proxy=None):
 
 #</editor-fold>
 
-def main():
+def save_crawl_checkpoint(checkpoints, company_store, discovery_queue, refresh_scheduler, crawl_state):
+    """Persists pending store writes, the frontier, refresh schedule and loop position together."""
+    company_store.commit()
+    discovery_queue.save()
+    if refresh_scheduler is not None: refresh_scheduler.save()
+    checkpoints.save(crawl_state)
+    print(f"--- Checkpoint saved ({len(discovery_queue)} queued, industry {crawl_state['current_industry_index']}, page {crawl_state['search_page_num']}) ---")
+
+def main(resume=False):
     """Main execution function for the LinkedIn scraper."""
-    all_scraped_data, scraped_slugs = load_existing_data(DATA_FILE)
-    scraped_this_run = []
+    company_store = load_existing_data(DATA_FILE)
+    scraped_count, refreshed_count = 0, 0
     all_credentials = parse_credentials(CREDENTIALS_FILE)
     all_proxies = load_proxies(PROXIES_FILE)
     if not all_credentials: return
     master_account_proxy_pairs = list(zip(all_credentials, cycle(all_proxies))) if all_proxies else [(c, None) for c in all_credentials]
     
     # --- Global State for the entire run ---
-    discovery_queue = []
+    discovery_queue = DiscoveryFrontier(FRONTIER_FILE)
+    page_archive = PageArchive(ARCHIVE_DIR) if ARCHIVE_PAGES else None
+    search_index = CompanySearchIndex(SEARCH_DB_FILE) if INDEX_OVERVIEWS else None
+    embedding_index = None
+    if EMBED_OVERVIEWS:
+        from similarity import EmbeddingIndex  # numpy/scipy are only needed with this feature on
+        embedding_index = EmbeddingIndex.open_if_built()
+    edge_log = EdgeLog(EDGE_LOG_FILE) if TRACK_EDGES else None
+    refresh_scheduler = build_scheduler(company_store.iter_records(), REFRESH_STATE_FILE) if REFRESH_EVERY else None
+    location_resolver = LocationResolver() if NORMALIZE_LOCATIONS else None
+    timeseries = None
+    if TRACK_TIMESERIES:
+        from timeseries import TimeSeriesStore  # numpy is only needed with this feature on
+        timeseries = TimeSeriesStore(TIMESERIES_DIR)
     search_industries = list(PRIORITY_INDUSTRIES)
     random.shuffle(search_industries)
     current_industry_index = 0
     search_page_num = 1
+    checkpoints = CheckpointManager(CHECKPOINT_FILE, CHECKPOINT_EVERY)
+    crawl_state = lambda: {"search_industries": search_industries, "current_industry_index": current_industry_index,
+                           "search_page_num": search_page_num, "scraped_count": scraped_count, "refreshed_count": refreshed_count}
+    resume_state = checkpoints.load() if resume else None
+    if resume_state:
+        search_industries = resume_state["search_industries"]
+        current_industry_index = resume_state["current_industry_index"]
+        search_page_num = resume_state["search_page_num"]
+        scraped_count, refreshed_count = resume_state["scraped_count"], resume_state["refreshed_count"]
     
     # --- Session State ---
     driver, wait = None, None
@@ -398,12 +482,17 @@ def main():
     session_limit = 0
     quarantined_in_run = {"accounts": [], "proxies": []}
     current_credential = None
+    current_slug, is_refresh = None, False
 
+    configure_metrics(METRICS_FILE)
+    checkpoints.install_signal_handlers()
     print(f"--- Starting dynamic scraping loop. Will scrape up to {MAX_NEW_COMPANIES} new companies. ---")
     account_cycler = cycle(master_account_proxy_pairs)
 
     try:
-        while len(scraped_this_run) < MAX_NEW_COMPANIES:
+        while scraped_count < MAX_NEW_COMPANIES:
+            if checkpoints.requested:
+                save_crawl_checkpoint(checkpoints, company_store, discovery_queue, refresh_scheduler, crawl_state())
             try:
                 if not driver or session_scrape_count >= session_limit:
                     if driver: driver.quit()
@@ -416,12 +505,18 @@ def main():
                         continue
                     session_scrape_count = 0
                     session_limit = random.randint(*COMPANIES_PER_ACCOUNT_RANGE)
+                    set_metrics_context(session=f"{current_credential['username']}@{int(time.time())}")
                     print(f"--- New session for {current_credential['username']}. Limit: {session_limit} scrapes. ---")
 
-                current_slug = None
-                if discovery_queue:
-                    current_slug = discovery_queue.pop(0)
-                    if current_slug in scraped_slugs: continue
+                current_slug, is_refresh = None, False
+                set_metrics_context(company=None)
+                pages_done = scraped_count + refreshed_count
+                refresh_slug = refresh_scheduler.next_due() if refresh_scheduler is not None and pages_done % REFRESH_EVERY == REFRESH_EVERY - 1 else None
+                if refresh_slug:
+                    current_slug, is_refresh = refresh_slug, True
+                elif discovery_queue:
+                    current_slug = discovery_queue.pop()
+                    if current_slug in company_store: continue
                 else:
                     if current_industry_index >= len(search_industries):
                         print("\n--- All priority industries have been searched. Ending script. ---")
@@ -435,34 +530,55 @@ def main():
                         search_page_num = 1
                         continue
 
-                    current_slug = find_first_new_company_on_page(driver, wait, current_industry, search_page_num, scraped_slugs)
+                    current_slug = find_first_new_company_on_page(driver, wait, current_industry, search_page_num, company_store)
                     
                     search_page_num += 1
                     if not current_slug:
                         continue
 
-                print(f"\n[{len(scraped_this_run) + 1}/{MAX_NEW_COMPANIES}] Processing: {current_slug} (Session: {session_scrape_count + 1}/{session_limit})")
-                company_data = scrape_company_data(driver, wait, current_slug)
-                all_scraped_data.append(company_data)
-                scraped_slugs.add(current_slug)
-                scraped_this_run.append(current_slug)
+                set_metrics_context(company=current_slug)
+                if is_refresh:
+                    print(f"\n[refresh {refreshed_count + 1}] Re-checking: {current_slug} (Session: {session_scrape_count + 1}/{session_limit})")
+                else:
+                    print(f"\n[{scraped_count + 1}/{MAX_NEW_COMPANIES}] Processing: {current_slug} (Session: {session_scrape_count + 1}/{session_limit})")
+                company_data = scrape_company_data(driver, wait, current_slug, page_archive)
+                if is_refresh:
+                    # A field whose lookup timed out keeps its stored value instead of being dropped from the record.
+                    company_data = {**(company_store.get(current_slug) or {}), **company_data}
+                if location_resolver: add_location(company_data, location_resolver)
+                company_data = stamp_record(company_data)
+                if timeseries is not None: timeseries.record(company_data)
+                changed = refresh_scheduler.observe(company_data) if refresh_scheduler is not None else True
+                if changed:
+                    company_store.append(company_data)
+                    if search_index is not None:
+                        with timed("search_index.add"): search_index.add(company_data)
+                    if embedding_index is not None:
+                        with timed("embedding_index.add"): embedding_index.add(company_data)
+                if is_refresh:
+                    refreshed_count += 1
+                    print(f"Refresh of '{current_slug}': {'content changed, record updated' if changed else 'unchanged, nothing written'}.")
+                else:
+                    scraped_count += 1
                 session_scrape_count += 1
                 
-                discover_new_companies(driver, wait, scraped_slugs, discovery_queue, current_slug)
+                discover_new_companies(driver, wait, company_store, discovery_queue, current_slug, edge_log)
+                if checkpoints.due(scraped_count + refreshed_count):
+                    save_crawl_checkpoint(checkpoints, company_store, discovery_queue, refresh_scheduler, crawl_state())
                 perform_curiosity_click(driver, wait)
-                time.sleep(random.uniform(2.5, 5.5))
+                with timed("sleep.between_companies"): time.sleep(random.uniform(2.5, 5.5))
 
             except SessionInvalidException as e:
                 print(f"!!! SESSION ERROR for {current_credential['username']}: {e}. Switching session. !!!")
                 if current_proxy and str(current_proxy) not in quarantined_in_run["proxies"]:
                     quarantine_asset(current_proxy, BAD_PROXIES_FILE)
                     quarantined_in_run["proxies"].append(str(current_proxy))
-                if current_slug: discovery_queue.insert(0, current_slug)
+                if current_slug: requeue_slug(current_slug, is_refresh, discovery_queue, refresh_scheduler)
                 if driver: driver.quit()
                 driver = None
             except (TimeoutException, NoSuchElementException, WebDriverException) as e:
                 print(f"-> RECOVERABLE ERROR for '{current_slug}': {type(e).__name__}. Re-queuing and switching session.")
-                if current_slug: discovery_queue.insert(0, current_slug)
+                if current_slug: requeue_slug(current_slug, is_refresh, discovery_queue, refresh_scheduler)
                 if driver: driver.quit()
                 driver = None
 
@@ -472,19 +588,27 @@ def main():
     finally:
         if driver: driver.quit()
         print("\n" + "="*25 + "\n--- SCRAPING SUMMARY ---" + "\n" + "="*25)
-        print(f"Total new companies scraped: {len(scraped_this_run)}")
+        print(f"Total new companies scraped: {scraped_count}")
+        print(f"Stored companies re-checked: {refreshed_count}")
         if quarantined_in_run["accounts"] or quarantined_in_run["proxies"]:
             print("\n--- QUARANTINE REPORT ---")
             if quarantined_in_run["accounts"]: print(f"Quarantined Accounts: {quarantined_in_run['accounts']}")
             if quarantined_in_run["proxies"]: print(f"Quarantined Proxies: {quarantined_in_run['proxies']}")
-        if all_scraped_data:
-            print(f"\nSaving {len(all_scraped_data)} total companies to '{DATA_FILE}'...")
-            try:
-                with open(DATA_FILE, "w", encoding='utf-8') as f:
-                    json.dump(all_scraped_data, f, indent=2, ensure_ascii=False)
-                print(f"Data successfully saved to '{DATA_FILE}'")
-            except IOError as e:
-                print(f"!!! CRITICAL: Could not save data to file: {e} !!!")
+        print(f"\n{len(company_store)} total companies stored ({STORAGE_BACKEND} backend).")
+        if current_slug and current_slug not in company_store: discovery_queue.requeue(current_slug)
+        save_crawl_checkpoint(checkpoints, company_store, discovery_queue, refresh_scheduler, crawl_state())
+        company_store.close()
+        if page_archive: page_archive.close()
+        if search_index is not None: search_index.close()
+        if embedding_index is not None: embedding_index.close()
+        if timeseries is not None: timeseries.close()
+        if edge_log: edge_log.close()
+        close_metrics()
+        if RECORDER.histograms:
+            print("\n--- TIMING SUMMARY ---")
+            for line in RECORDER.summary_lines(): print(line)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="LinkedIn company scraper.")
+    parser.add_argument("--resume", action="store_true", help=f"Continue from the state saved in '{CHECKPOINT_FILE}'.")
+    main(resume=parser.parse_args().resume)
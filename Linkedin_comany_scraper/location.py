@@ -0,0 +1,147 @@
+import os
+import re
+import argparse
+import unicodedata
+from collections import Counter, namedtuple
+from functools import lru_cache
+from record_store import iter_latest_records, write_records_atomically
+
+# --- Configuration ---
+GAZETTEER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.tsv")
+RESOLVER_CACHE_SIZE = 8192  # distinct headquarters strings memoized; values repeat heavily across companies
+LOCATION_FIELDS = ["hq_city", "hq_region", "hq_country"]
+NON_NAME_CHARACTERS = re.compile(r"[\d.,'’()/&-]+")
+WHITESPACE_RUN = re.compile(r"\s+")
+
+Place = namedtuple("Place", ["kind", "name", "region", "country"])
+EMPTY_LOCATION = (None, None, None)
+
+#<editor-fold desc="Gazetteer Index">
+
+def place_key(text):
+    """Folds accents, case, digits (postcodes) and punctuation so 'Île-de-France' and 'ile de france' meet."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return WHITESPACE_RUN.sub(" ", NON_NAME_CHARACTERS.sub(" ", stripped.casefold())).strip()
+
+def load_gazetteer(file_path=GAZETTEER_FILE):
+    """Reads the bundled `kind<TAB>code<TAB>name<TAB>aliases` file into a folded-name -> places dict.
+
+    Region codes are ISO 3166-2 (`US-WA`), so a place's country is the part before the dash.
+    """
+    index = {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip(): continue
+            kind, code, name, aliases = (line.rstrip('\n').split('\t') + [""])[:4]
+            place = Place(kind, name, code if '-' in code else None, code.split('-')[0])
+            for alias in [name, *filter(None, aliases.split('|'))]:
+                key = place_key(alias)
+                if key and place not in index.get(key, ()):
+                    index[key] = index.get(key, ()) + (place,)
+    return index
+#</editor-fold>
+
+#<editor-fold desc="Resolver">
+
+class LocationResolver:
+    """Maps free-text headquarters ('Redmond, Washington', 'Bangalore, KA') to (city, region code, country code).
+
+    The last comma-separated part may name a country; regions are searched right to left
+    and filtered by that country; the city is the first part not already used for either,
+    kept as written when the gazetteer does not know it. Ambiguous abbreviations such as
+    'TN' (Tennessee / Tamil Nadu) are settled by which region actually contains the city.
+    When the last part names no known place at all ('San Jose, Costa Rica' with no Costa
+    Rica row), only the city is kept rather than guessing a country from an earlier part.
+    """
+
+    def __init__(self, gazetteer_path=GAZETTEER_FILE, cache_size=RESOLVER_CACHE_SIZE):
+        self.index = load_gazetteer(gazetteer_path)
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _places(self, key, kind):
+        return [place for place in self.index.get(key, ()) if place.kind == kind]
+
+    def _resolve(self, headquarters):
+        parts = [(raw.strip(), place_key(raw)) for raw in (headquarters or "").split(',')]
+        parts = [(raw, key) for raw, key in parts if key]
+        if not parts: return EMPTY_LOCATION
+        used = set()
+        countries = self._places(parts[-1][1], "country")
+        if len(parts) > 1:
+            last_regions = {p.region for p in self._places(parts[-1][1], "region")}
+            if not countries and not last_regions and not self._places(parts[-1][1], "city"):
+                return parts[0][0], None, None  # an unknown country; an earlier part would only guess one
+            if countries and any(p.region in last_regions for p in self._places(parts[0][1], "city")):
+                countries = []  # 'Atlanta, Georgia': the region containing the city beats the country
+        country = countries[0].country if countries else None
+        if country: used.add(len(parts) - 1)
+
+        regions = []
+        for i in range(len(parts) - 1, -1, -1):
+            if i in used: continue
+            regions = [p for p in self._places(parts[i][1], "region") if country in (None, p.country)]
+            if regions:
+                used.add(i)
+                break
+
+        city_indexes = [i for i in range(len(parts)) if i not in used] or [0]
+        if regions: city_indexes = city_indexes[:1]  # with a known region, only the leading part can be the city
+        city, city_name = None, None
+        for i in city_indexes:
+            city = next((p for p in self._places(parts[i][1], "city")
+                         if (not regions or p.region in {r.region for r in regions}) and country in (None, p.country)), None)
+            if city: break
+        if city:
+            city_name = city.name
+        elif city_indexes[0] not in used:
+            city_name = parts[city_indexes[0]][0]
+
+        region = city.region if city and city.region else (regions[0].region if regions else None)
+        country = country or (regions[0].country if regions else None) or (city.country if city else None)
+        if city and city.region: country = city.country
+        return city_name, region, country
+
+    def locate(self, headquarters):
+        return dict(zip(LOCATION_FIELDS, self.resolve(headquarters)))
+
+def add_location(record, resolver):
+    """Writes hq_city / hq_region / hq_country next to `headquarters`, omitting parts that did not resolve."""
+    for field in LOCATION_FIELDS: record.pop(field, None)
+    if record.get("headquarters"):
+        record.update({field: value for field, value in resolver.locate(record["headquarters"]).items() if value})
+    return record
+#</editor-fold>
+
+def backfill_locations(data_file, resolver=None):
+    """Rewrites a JSONL store with location fields on every record (run while the scraper is stopped)."""
+    resolver = resolver or LocationResolver()
+    countries = Counter()
+    def located():
+        for record in iter_latest_records(data_file):
+            add_location(record, resolver)
+            countries[record.get("hq_country")] += 1
+            yield record
+    count = write_records_atomically(data_file, located())
+    print(f"Located {count - countries[None]} of {count} companies in '{data_file}' ({resolver.resolve.cache_info().currsize} distinct headquarters).")
+    return countries
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline headquarters normalization against the bundled gazetteer.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = subparsers.add_parser("backfill", help="Add hq_city/hq_region/hq_country to every stored record.")
+    backfill_parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    resolve_parser = subparsers.add_parser("resolve", help="Show how headquarters strings resolve.")
+    resolve_parser.add_argument("headquarters", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        if args.data_file.endswith(".json"):
+            print("!!! Backfill rewrites a JSONL store; migrate the legacy array first with 'python record_store.py migrate'. !!!")
+        else:
+            for code, count in backfill_locations(args.data_file).most_common(15):
+                print(f"  {code or '(unresolved)':<16}{count:>8}")
+    else:
+        location_resolver = LocationResolver()
+        for text in args.headquarters:
+            print(f"{text!r:<48}-> {location_resolver.resolve(text)}")
@@ -0,0 +1,176 @@
+import json
+import math
+import time
+import argparse
+import threading
+from collections import defaultdict
+from contextlib import ContextDecorator
+
+# --- Configuration ---
+METRICS_FILE = "metrics.jsonl"
+FLUSH_EVERY = 50  # events buffered before they are written to the sink
+BUCKETS_PER_DOUBLING = 4  # histogram resolution: bucket bounds grow by 2**(1/4) (~19%)
+MIN_BUCKET_SECONDS = 0.001
+
+#<editor-fold desc="Histograms">
+
+class PhaseHistogram:
+    """Log-scale latency histogram with constant memory per phase."""
+
+    def __init__(self):
+        self.buckets = defaultdict(int)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def bucket_for(seconds):
+        if seconds <= MIN_BUCKET_SECONDS: return 0
+        return math.ceil(math.log2(seconds / MIN_BUCKET_SECONDS) * BUCKETS_PER_DOUBLING)
+
+    @staticmethod
+    def upper_bound(bucket):
+        return MIN_BUCKET_SECONDS * 2 ** (bucket / BUCKETS_PER_DOUBLING)
+
+    def add(self, seconds):
+        self.buckets[self.bucket_for(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile sample."""
+        if not self.count: return 0.0
+        target = math.ceil(q / 100 * self.count)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target: return min(self.upper_bound(bucket), self.max)
+        return self.max
+#</editor-fold>
+
+#<editor-fold desc="Recorder and Timers">
+
+class MetricsRecorder:
+    def __init__(self):
+        self.sink = None
+        self.buffer = []
+        self.histograms = defaultdict(PhaseHistogram)
+        self.context = {"session": None, "company": None}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def configure(self, file_path):
+        self.close()
+        self.sink = open(file_path, 'a', encoding='utf-8')
+
+    def set_context(self, **context):
+        self.context.update(context)
+
+    def record(self, phase, seconds, depth):
+        self.histograms[phase].add(seconds)
+        if not self.sink: return
+        event = {"ts": round(time.time(), 3), "phase": phase, "seconds": round(seconds, 6), "depth": depth, **self.context}
+        with self.lock:
+            self.buffer.append(json.dumps(event) + '\n')
+            if len(self.buffer) >= FLUSH_EVERY: self.flush()
+
+    def flush(self):
+        if self.sink and self.buffer:
+            self.sink.writelines(self.buffer)
+            self.sink.flush()
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.sink: self.sink.close()
+        self.sink = None
+
+    def summary_lines(self):
+        lines = [f"{'phase':<36}{'count':>7}{'total s':>10}{'mean s':>9}{'p50 s':>8}{'p90 s':>8}{'p99 s':>8}"]
+        for phase, hist in sorted(self.histograms.items(), key=lambda item: -item[1].total):
+            lines.append(f"{phase:<36}{hist.count:>7}{hist.total:>10.1f}{hist.total / hist.count:>9.3f}"
+                         f"{hist.percentile(50):>8.3f}{hist.percentile(90):>8.3f}{hist.percentile(99):>8.3f}")
+        return lines
+
+RECORDER = MetricsRecorder()
+
+class timed(ContextDecorator):
+    """Times a block or function as `phase`: `with timed("driver.get"): ...` or `@timed("scroll")`."""
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def _recreate_cm(self):
+        # As a decorator, each call needs its own start/depth; recursive or threaded calls would share one instance.
+        return type(self)(self.phase)
+
+    def __enter__(self):
+        depth = getattr(RECORDER.local, "depth", 0)
+        RECORDER.local.depth = depth + 1
+        self.depth = depth
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        RECORDER.record(self.phase, time.perf_counter() - self.start, self.depth)
+        RECORDER.local.depth = self.depth
+        return False
+
+def configure_metrics(file_path=METRICS_FILE):
+    RECORDER.configure(file_path)
+
+def set_metrics_context(**context):
+    RECORDER.set_context(**context)
+
+def close_metrics():
+    RECORDER.close()
+#</editor-fold>
+
+#<editor-fold desc="Report Command">
+
+def build_report(file_path):
+    phases = defaultdict(PhaseHistogram)
+    per_company = defaultdict(float)
+    per_session = defaultdict(lambda: {"seconds": 0.0, "companies": set()})
+    top_level_total = 0.0
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try: event = json.loads(line)
+            except json.JSONDecodeError: continue
+            phases[event["phase"]].add(event["seconds"])
+            if event.get("depth", 0) != 0: continue
+            top_level_total += event["seconds"]
+            if event.get("company"): per_company[event["company"]] += event["seconds"]
+            session = per_session[event.get("session") or "-"]
+            session["seconds"] += event["seconds"]
+            if event.get("company"): session["companies"].add(event["company"])
+    return phases, per_company, per_session, top_level_total
+
+def print_report(file_path, top=10):
+    phases, per_company, per_session, top_level_total = build_report(file_path)
+    companies = max(len(per_company), 1)
+    print(f"--- Per-phase timings from '{file_path}' ({len(per_company)} companies, {top_level_total:.1f}s top-level) ---")
+    print(f"{'phase':<36}{'count':>7}{'total s':>10}{'s/company':>11}{'share':>8}{'p50 s':>8}{'p90 s':>8}{'p99 s':>8}")
+    for phase, hist in sorted(phases.items(), key=lambda item: -item[1].total):
+        share = hist.total / top_level_total if top_level_total else 0.0
+        print(f"{phase:<36}{hist.count:>7}{hist.total:>10.1f}{hist.total / companies:>11.2f}{share:>8.1%}"
+              f"{hist.percentile(50):>8.3f}{hist.percentile(90):>8.3f}{hist.percentile(99):>8.3f}")
+    print(f"\n--- Slowest {top} companies (top-level seconds) ---")
+    for company, seconds in sorted(per_company.items(), key=lambda item: -item[1])[:top]:
+        print(f"{company:<48}{seconds:>9.1f}")
+    print("\n--- Sessions ---")
+    for session, stats in per_session.items():
+        count = len(stats["companies"])
+        per = stats["seconds"] / count if count else 0.0
+        print(f"{session:<48}{count:>6} companies {stats['seconds']:>9.1f}s {per:>7.1f}s/company")
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize scraper timing metrics.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report_parser = subparsers.add_parser("report", help="Summarize where time goes per phase, company and session.")
+    report_parser.add_argument("file_path", nargs="?", default=METRICS_FILE)
+    report_parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    print_report(args.file_path, args.top)
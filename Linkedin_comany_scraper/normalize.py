@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+import argparse
+import pandas as pd
+from field_patterns import FOLLOWERS_PATTERN, COMPANY_SIZE_PATTERN, JOB_OPENINGS_PATTERN, SUFFIX_MULTIPLIERS
+
+# --- Configuration ---
+CACHE_FILE = "normalized_companies.pkl"
+CACHE_META_FILE = CACHE_FILE + ".meta.json"
+RAW_COLUMNS = ["company_slug", "followers", "overview", "website", "industry", "company_size", "headquarters", "job_openings_text", "hq_city", "hq_region", "hq_country"]
+
+#<editor-fold desc="Loading">
+
+def load_raw_frame(file_path):
+    """Reads a legacy JSON array or a JSONL store into a DataFrame with one row per slug."""
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return pd.DataFrame(columns=RAW_COLUMNS)
+    frame = pd.read_json(file_path, lines=not file_path.endswith(".json"), dtype=False)
+    for column in RAW_COLUMNS:
+        if column not in frame.columns: frame[column] = None
+    return frame.drop_duplicates("company_slug", keep="last").reset_index(drop=True)
+#</editor-fold>
+
+#<editor-fold desc="Vectorized Normalizers">
+
+def _to_int(series):
+    return pd.to_numeric(series.str.replace(",", "", regex=False), errors="coerce").round().astype("Int64")
+
+def parse_followers(series):
+    """'5M followers' / '382K followers' / '1,234 followers' -> integer follower count."""
+    parts = series.astype("string").str.extract(FOLLOWERS_PATTERN)
+    number = pd.to_numeric(parts["number"].str.replace(",", "", regex=False), errors="coerce")
+    multiplier = parts["suffix"].map(SUFFIX_MULTIPLIERS).fillna(1)
+    return (number * multiplier).round().astype("Int64")
+
+def parse_company_size(series):
+    """'11-50 employees' -> (11, 50); '10,001+ employees' -> (10001, <NA>)."""
+    parts = series.astype("string").str.extract(COMPANY_SIZE_PATTERN)
+    return _to_int(parts["lower"]), _to_int(parts["upper"])
+
+def parse_job_openings(series):
+    """'Microsoft has 5,601 job openings - find the one for you.' -> 5601."""
+    parts = series.astype("string").str.extract(JOB_OPENINGS_PATTERN)
+    return _to_int(parts["count"])
+
+def normalize_frame(frame):
+    normalized = frame.copy()
+    normalized["followers_count"] = parse_followers(frame["followers"])
+    normalized["company_size_min"], normalized["company_size_max"] = parse_company_size(frame["company_size"])
+    normalized["job_openings_count"] = parse_job_openings(frame["job_openings_text"])
+    return normalized
+#</editor-fold>
+
+#<editor-fold desc="Cache Management">
+
+def _file_signature(file_path):
+    stat = os.stat(file_path)
+    return {"path": os.path.abspath(file_path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "columns": RAW_COLUMNS}
+
+def _file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _read_cache_meta():
+    try:
+        with open(CACHE_META_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return None
+
+def load_normalized(file_path, force=False):
+    """Returns the normalized company table, recomputing it only when the source file changed.
+
+    A matching mtime and size reuse the cache directly; otherwise the content hash is
+    compared so a touched but unchanged file does not trigger a rebuild.
+    """
+    signature = _file_signature(file_path)
+    meta = _read_cache_meta()
+    if not force and meta and os.path.exists(CACHE_FILE) and meta.get("path") == signature["path"] and meta.get("columns") == RAW_COLUMNS:
+        if meta.get("mtime_ns") == signature["mtime_ns"] and meta.get("size") == signature["size"]:
+            return pd.read_pickle(CACHE_FILE)
+        content_hash = _file_hash(file_path)
+        if meta.get("sha256") == content_hash:
+            with open(CACHE_META_FILE, 'w', encoding='utf-8') as f:
+                json.dump({**signature, "sha256": content_hash}, f)
+            return pd.read_pickle(CACHE_FILE)
+    print(f"Normalizing '{file_path}'...")
+    normalized = normalize_frame(load_raw_frame(file_path))
+    normalized.to_pickle(CACHE_FILE)
+    with open(CACHE_META_FILE, 'w', encoding='utf-8') as f:
+        json.dump({**signature, "sha256": _file_hash(file_path)}, f)
+    return normalized
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the normalized company table with typed numeric columns.")
+    parser.add_argument("file_path", nargs="?", default="scraped_data.jsonl")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and recompute.")
+    args = parser.parse_args()
+    table = load_normalized(args.file_path, force=args.force)
+    typed_columns = ["followers_count", "company_size_min", "company_size_max", "job_openings_count"]
+    print(f"{len(table)} companies normalized.")
+    print(table[typed_columns].describe().to_string())
@@ -0,0 +1,172 @@
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from record_store import write_records_atomically
+
+# --- Configuration ---
+ARCHIVE_DIR = "page_archive"
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+COMPRESSION_LEVEL = 6
+EXTRACT_CHUNK_SIZE = 64
+BLOCK_TAGS = {"br", "p", "div", "li", "ul", "ol", "dl", "dt", "dd", "h1", "h2", "h3", "h4", "section", "article", "header", "footer"}
+WHITESPACE_RUN = re.compile(r'\s+')
+DETAIL_LABELS = {"website": "Website", "industry": "Industry", "company_size": "Company size", "headquarters": "Headquarters"}
+
+#<editor-fold desc="Page Archive">
+
+class PageArchive:
+    """Content-addressed archive of raw company pages.
+
+    Each distinct page body is stored once as an independent gzip member appended to the
+    current segment file. `index.jsonl` maps (slug, page) to the blob's segment, byte
+    offset and length, so any page can be read back with a single seek.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, "index.jsonl")
+        os.makedirs(archive_dir, exist_ok=True)
+        self.blobs = {}  # sha256 -> (segment, offset, length)
+        self.pages = {}  # (slug, page) -> sha256 of the latest capture
+        self._load_index()
+        self.segment_number = max((loc[0] for loc in self.blobs.values()), default=0)
+        self._segment_file = None
+        self._index_file = open(self.index_path, 'a', encoding='utf-8')
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path): return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try: entry = json.loads(line)
+                except json.JSONDecodeError: continue
+                self.blobs[entry["sha256"]] = (entry["segment"], entry["offset"], entry["length"])
+                self.pages[(entry["slug"], entry["page"])] = entry["sha256"]
+
+    def segment_path(self, segment_number):
+        return os.path.join(self.archive_dir, f"segment_{segment_number:05d}.gz")
+
+    def _current_segment(self):
+        if self._segment_file is None:
+            self._segment_file = open(self.segment_path(self.segment_number), 'ab')
+        if self._segment_file.tell() >= SEGMENT_MAX_BYTES:
+            self._segment_file.close()
+            self.segment_number += 1
+            self._segment_file = open(self.segment_path(self.segment_number), 'ab')
+        return self._segment_file
+
+    def put(self, slug, page, html):
+        """Archives one page capture; identical bodies are stored only once."""
+        body = html.encode('utf-8')
+        sha256 = hashlib.sha256(body).hexdigest()
+        if sha256 not in self.blobs:
+            segment_file = self._current_segment()
+            offset = segment_file.tell()
+            compressed = gzip.compress(body, compresslevel=COMPRESSION_LEVEL)
+            segment_file.write(compressed)
+            segment_file.flush()
+            self.blobs[sha256] = (self.segment_number, offset, len(compressed))
+        segment, offset, length = self.blobs[sha256]
+        entry = {"slug": slug, "page": page, "sha256": sha256, "segment": segment, "offset": offset, "length": length, "archived_at": int(time.time())}
+        self._index_file.write(json.dumps(entry) + '\n')
+        self._index_file.flush()
+        self.pages[(slug, page)] = sha256
+
+    def get(self, slug, page):
+        sha256 = self.pages.get((slug, page))
+        if sha256 is None: return None
+        return read_blob(self.archive_dir, *self.blobs[sha256])
+
+    def slugs(self):
+        return sorted({slug for slug, _ in self.pages})
+
+    def close(self):
+        for handle in (self._segment_file, self._index_file):
+            if handle and not handle.closed: handle.close()
+
+def read_blob(archive_dir, segment, offset, length):
+    with open(os.path.join(archive_dir, f"segment_{segment:05d}.gz"), 'rb') as f:
+        f.seek(offset)
+        return gzip.decompress(f.read(length)).decode('utf-8')
+#</editor-fold>
+
+#<editor-fold desc="Offline Extraction">
+
+def _collect_text(element, parts):
+    if not isinstance(element.tag, str): return  # comments and processing instructions
+    is_block = element.tag in BLOCK_TAGS
+    if is_block: parts.append('\n')
+    if element.text: parts.append(WHITESPACE_RUN.sub(' ', element.text))
+    for child in element:
+        _collect_text(child, parts)
+        if child.tail: parts.append(WHITESPACE_RUN.sub(' ', child.tail))
+    if is_block: parts.append('\n')
+
+def _first_text(tree, xpath):
+    """Rendered-text approximation of Selenium's `element.text.strip()` for the first match:
+    source whitespace collapses, while <br> and block elements start new lines."""
+    matches = tree.xpath(xpath)
+    if not matches: return None
+    parts = []
+    _collect_text(matches[0], parts)
+    lines = [' '.join(line.split()) for line in ''.join(parts).split('\n')]
+    return '\n'.join(line for line in lines if line)
+
+def extract_record(slug, about_html, jobs_html=None):
+    """Re-derives a company record from archived pages with one lxml parse per page.
+
+    lxml is imported here rather than at module level so the scraper can archive pages
+    without it; only offline re-extraction needs it.
+    """
+    import lxml.html
+    record = {"company_slug": slug}
+    if about_html:
+        tree = lxml.html.fromstring(about_html)
+        followers = _first_text(tree, "//a[contains(@href, '/followers/')]")
+        if followers is not None: record["followers"] = followers
+        overview = _first_text(tree, "//h2[normalize-space(.)='Overview']/following-sibling::p")
+        if overview is not None: record["overview"] = overview
+        for key, label in DETAIL_LABELS.items():
+            value = _first_text(tree, f"//dt[normalize-space(.)='{label}']/following-sibling::dd[1]")
+            if value is not None: record[key] = value.split('\n')[0]
+    if jobs_html:
+        tree = lxml.html.fromstring(jobs_html)
+        job_text = _first_text(tree, "//*[self::h1 or self::h2 or self::h3 or self::h4][contains(., 'job') or contains(., 'result')]")
+        if job_text is not None: record["job_openings_text"] = job_text
+    return record
+
+def _extract_chunk(archive_dir, chunk):
+    records = []
+    for slug, about_location, jobs_location in chunk:
+        about_html = read_blob(archive_dir, *about_location) if about_location else None
+        jobs_html = read_blob(archive_dir, *jobs_location) if jobs_location else None
+        records.append(extract_record(slug, about_html, jobs_html))
+    return records
+
+def reextract_all(output_path, archive_dir=ARCHIVE_DIR, workers=None):
+    """Rebuilds every record from the archive across a process pool; no network access needed."""
+    archive = PageArchive(archive_dir)
+    archive.close()
+    jobs = []
+    for slug in archive.slugs():
+        about_sha, jobs_sha = archive.pages.get((slug, "about")), archive.pages.get((slug, "jobs"))
+        jobs.append((slug, archive.blobs.get(about_sha), archive.blobs.get(jobs_sha)))
+    chunks = [jobs[i:i + EXTRACT_CHUNK_SIZE] for i in range(0, len(jobs), EXTRACT_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_extract_chunk, [archive_dir] * len(chunks), chunks)
+        count = write_records_atomically(output_path, (record for chunk in results for record in chunk))
+    print(f"Re-extracted {count} companies from '{archive_dir}' into '{output_path}'.")
+    return count
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-extract company records from the raw page archive.")
+    parser.add_argument("output_path", nargs="?", default="reextracted_data.jsonl")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    reextract_all(args.output_path, args.archive_dir, args.workers)
@@ -0,0 +1,202 @@
+import os
+import json
+import asyncio
+import argparse
+from collections import Counter, OrderedDict
+from urllib.parse import urlsplit, parse_qsl, unquote
+from record_store import iter_latest_records
+from company_record import CompanyRecord
+from dedup import registrable_domain
+
+# --- Configuration ---
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+RESPONSE_CACHE_SIZE = 4096  # encoded responses kept per data-file version
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_HEADER_BYTES = 16384
+FILTER_FIELDS = ["industry", "company_size", "domain", "hq_country", "hq_region"]
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 431: "Request Header Fields Too Large"}
+
+#<editor-fold desc="Corpus Indexes">
+
+class CorpusIndex:
+    """Read-only snapshot of the corpus with in-memory indexes for every filterable field.
+
+    Records are kept as slotted `CompanyRecord`s in slug order; each index maps a field value
+    to the ascending list of positions holding it, so filtered listings come out in slug
+    order without sorting and intersect by scanning the shortest list.
+    """
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.version = file_version(data_file)
+        records = sorted((CompanyRecord.from_dict(r) for r in iter_latest_records(data_file)), key=lambda r: r.company_slug)
+        self.records = records
+        self.positions = {record.company_slug: i for i, record in enumerate(records)}
+        self.indexes = {field: {} for field in FILTER_FIELDS}
+        for i, record in enumerate(records):
+            for field in FILTER_FIELDS:
+                value = registrable_domain(record.website) if field == "domain" else record.get(field)
+                if value: self.indexes[field].setdefault(value, []).append(i)
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, slug):
+        position = self.positions.get(slug)
+        return self.records[position].to_dict() if position is not None else None
+
+    def select(self, filters):
+        """Positions matching every filter, in slug order."""
+        if not filters: return range(len(self.records))
+        lists = sorted((self.indexes[field].get(value, []) for field, value in filters.items()), key=len)
+        if len(lists) == 1: return lists[0]
+        others = [set(positions) for positions in lists[1:]]
+        return [i for i in lists[0] if all(i in other for other in others)]
+
+    def aggregate(self, field, filters):
+        """Company count per value of `field` among the filtered companies, largest first."""
+        if not filters:
+            counts = Counter({value: len(positions) for value, positions in self.indexes[field].items()})
+        else:
+            selected = set(self.select(filters))
+            counts = Counter({value: sum(1 for i in positions if i in selected) for value, positions in self.indexes[field].items()})
+            counts = +counts
+        return counts.most_common()
+#</editor-fold>
+
+#<editor-fold desc="Query Handling">
+
+def file_version(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+class QueryService:
+    """Answers GET requests from the current `CorpusIndex`, caching encoded responses.
+
+    Every request stats the data file; when its mtime or size changed, the corpus is
+    reloaded in a worker thread (requests keep using the old snapshot meanwhile) and the
+    response cache is cleared.
+    """
+
+    def __init__(self, data_file, cache_size=RESPONSE_CACHE_SIZE):
+        self.data_file = data_file
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = self.misses = 0
+        self.corpus = CorpusIndex(data_file)
+        self._reloading = None
+
+    async def _refresh_if_changed(self):
+        if file_version(self.data_file) == self.corpus.version: return
+        if self._reloading is None:
+            self._reloading = asyncio.get_running_loop().run_in_executor(None, CorpusIndex, self.data_file)
+            self._reloading.add_done_callback(self._finish_reload)
+
+    def _finish_reload(self, future):
+        self._reloading = None
+        if future.exception():
+            print(f"!!! Could not reload '{self.data_file}': {future.exception()} !!!")
+            return
+        self.corpus = future.result()
+        self.cache.clear()
+        print(f"Reloaded {len(self.corpus)} companies from '{self.data_file}'.")
+
+    async def respond(self, target):
+        await self._refresh_if_changed()
+        cached = self.cache.get(target)
+        if cached is not None:
+            self.cache.move_to_end(target)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        response = self.route(target)
+        if response[0] == 200:
+            self.cache[target] = response
+            if len(self.cache) > self.cache_size: self.cache.popitem(last=False)
+        return response
+
+    def route(self, target):
+        parts = urlsplit(target)
+        path = [unquote(p) for p in parts.path.strip('/').split('/') if p]
+        query = dict(parse_qsl(parts.query))
+        try:
+            limit = int(query.pop("limit", DEFAULT_PAGE_SIZE))
+            offset = int(query.pop("offset", 0))
+        except ValueError:
+            return _json(400, {"error": "limit and offset must be integers"})
+        if limit < 0 or offset < 0: return _json(400, {"error": "limit and offset must not be negative"})
+        limit = min(limit, MAX_PAGE_SIZE)
+        unknown = set(query) - set(FILTER_FIELDS)
+        if unknown: return _json(400, {"error": f"unknown filters: {sorted(unknown)}", "filters": FILTER_FIELDS})
+
+        if path == ["health"]:
+            return _json(200, {"companies": len(self.corpus), "cache_entries": len(self.cache), "cache_hits": self.hits, "cache_misses": self.misses})
+        if len(path) == 2 and path[0] == "companies":
+            record = self.corpus.get(path[1])
+            return _json(200, record) if record else _json(404, {"error": f"unknown company '{path[1]}'"})
+        if path == ["companies"]:
+            selected = self.corpus.select(query)
+            page = [self.corpus.records[i].to_dict() for i in selected[offset:offset + limit]]
+            return _json(200, {"total": len(selected), "limit": limit, "offset": offset, "items": page})
+        if len(path) == 2 and path[0] == "aggregates" and path[1] in FILTER_FIELDS:
+            counts = self.corpus.aggregate(path[1], query)
+            page = [{"value": value, "companies": count} for value, count in counts[offset:offset + limit]]
+            return _json(200, {"field": path[1], "total": len(counts), "limit": limit, "offset": offset, "items": page})
+        return _json(404, {"error": "not found", "endpoints": ["/companies/<slug>", "/companies?<filter>=...", "/aggregates/<field>", "/health"]})
+
+def _json(status, body):
+    return status, json.dumps(body, ensure_ascii=False).encode('utf-8')
+#</editor-fold>
+
+#<editor-fold desc="HTTP Server">
+
+async def handle_connection(service, reader, writer):
+    """Minimal HTTP/1.1 over asyncio streams: GET only, keep-alive unless the client closes."""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except asyncio.LimitOverrunError:
+                writer.write(_http_response(431, b"{}", keep_alive=False))
+                break
+            request_line, *header_lines = head.decode('latin-1').split("\r\n")
+            method, target, version = (request_line.split(" ") + ["", ""])[:3]
+            headers = {name.strip().lower(): value.strip() for name, _, value in (line.partition(":") for line in header_lines if line)}
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            if method != "GET":
+                status, body = _json(405, {"error": "only GET is supported"})
+            else:
+                status, body = await service.respond(target)
+            writer.write(_http_response(status, body, keep_alive))
+            await writer.drain()
+            if not keep_alive: break
+    finally:
+        writer.close()
+
+def _http_response(status, body, keep_alive):
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\nContent-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+async def serve(data_file, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    service = QueryService(data_file)
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port, limit=MAX_HEADER_BYTES)
+    print(f"Serving {len(service.corpus)} companies from '{data_file}' on http://{host}:{port}/")
+    async with server:
+        await server.serve_forever()
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only HTTP/JSON query service over the scraped companies.")
+    parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.data_file, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nQuery service stopped.")
@@ -0,0 +1,210 @@
+import json
+import os
+import argparse
+from company_record import CompanyRecord
+
+# --- Configuration ---
+COMPACT_STALE_THRESHOLD = 1000  # superseded lines tolerated before the data file is rewritten
+INDEX_SUFFIX = ".slugs"
+
+#<editor-fold desc="Record Iteration Helpers">
+
+def iter_records(file_path):
+    """Yields company records from either a legacy JSON array file or a JSONL store."""
+    if not os.path.exists(file_path):
+        return
+    if file_path.endswith(".json"):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            try: data = json.load(f)
+            except json.JSONDecodeError: data = []
+        yield from data
+        return
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'): break  # torn final write
+            line = line.strip()
+            if not line: continue
+            try: yield json.loads(line)
+            except json.JSONDecodeError: continue
+
+def iter_latest_records(file_path):
+    """Yields one record per slug, keeping the most recently appended version.
+
+    The whole corpus is held until the last line is read, so it is kept as slotted
+    `CompanyRecord`s and only turned back into dicts on the way out.
+    """
+    latest = {}
+    for record in iter_records(file_path):
+        slug = record.get('company_slug')
+        if slug:
+            latest.pop(slug, None)
+            latest[slug] = CompanyRecord.from_dict(record)
+    for slug in list(latest):
+        yield latest.pop(slug).to_dict()
+#</editor-fold>
+
+#<editor-fold desc="JSONL Record Store">
+
+class JsonlRecordStore:
+    """Append-only JSON-lines store of company records.
+
+    Every appended record is flushed and fsynced before `append` returns, so a killed
+    run loses at most the company in flight. A sidecar `<file>.slugs` index holds one
+    `slug<TAB>end_offset` line per record, which lets startup rebuild the slug set (with
+    the offset of each slug's latest line, for `get`) without decoding any record bodies.
+    """
+
+    def __init__(self, file_path, compact_threshold=COMPACT_STALE_THRESHOLD):
+        self.file_path = file_path
+        self.index_path = file_path + INDEX_SUFFIX
+        self.compact_threshold = compact_threshold
+        self.slugs = {}  # slug -> start offset of its latest line
+        self.line_count = 0
+        self._data_file = None
+        self._index_file = None
+        self._load_index()
+        self._open_for_append()
+
+    def __contains__(self, slug):
+        return slug in self.slugs
+
+    def __len__(self):
+        return len(self.slugs)
+
+    def _load_index(self):
+        indexed_end = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.rstrip('\n').split('\t')
+                    if len(parts) != 2 or not parts[1].isdigit(): continue
+                    self.slugs[parts[0]] = indexed_end
+                    self.line_count += 1
+                    indexed_end = int(parts[1])
+        data_size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        if indexed_end > data_size:
+            print(f"Slug index '{self.index_path}' is ahead of the data file. Rebuilding it.")
+            self.slugs, self.line_count, indexed_end = {}, 0, 0
+            open(self.index_path, 'w').close()
+        if data_size > indexed_end:
+            self._recover_tail(indexed_end)
+
+    def _recover_tail(self, start_offset):
+        """Indexes records written after the last index entry and truncates a torn final line."""
+        recovered = []
+        good_end = start_offset
+        with open(self.file_path, 'rb') as f:
+            f.seek(start_offset)
+            for raw_line in f:
+                if not raw_line.endswith(b'\n'): break
+                offset = good_end + len(raw_line)
+                try:
+                    slug = json.loads(raw_line).get('company_slug')
+                except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                    slug = None
+                if slug: recovered.append((slug, good_end, offset))
+                good_end = offset
+        if good_end < os.path.getsize(self.file_path):
+            print(f"Truncating incomplete trailing record in '{self.file_path}'.")
+            with open(self.file_path, 'r+b') as f:
+                f.truncate(good_end)
+        if recovered:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.writelines(f"{slug}\t{offset}\n" for slug, _, offset in recovered)
+            for slug, start, _ in recovered: self.slugs[slug] = start
+            self.line_count += len(recovered)
+
+    def _open_for_append(self):
+        self._data_file = open(self.file_path, 'ab')
+        self._index_file = open(self.index_path, 'a', encoding='utf-8')
+
+    def append(self, record):
+        slug = record.get('company_slug')
+        if not slug: raise ValueError("Record has no 'company_slug'.")
+        payload = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        start = self._data_file.tell()
+        self._data_file.write(payload)
+        self._data_file.flush()
+        os.fsync(self._data_file.fileno())
+        self._index_file.write(f"{slug}\t{self._data_file.tell()}\n")
+        self._index_file.flush()
+        self.slugs[slug] = start
+        self.line_count += 1
+        if self.line_count - len(self.slugs) >= self.compact_threshold:
+            self.compact()
+
+    def get(self, slug):
+        """Latest stored version of `slug`, read from its own line; None if it is not stored."""
+        offset = self.slugs.get(slug)
+        if offset is None: return None
+        with open(self.file_path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def commit(self):
+        """No-op: every append is already fsynced. Mirrors `SqliteCompanyStore.commit`."""
+
+    def iter_records(self):
+        """Latest version of every stored record (a full read of the data file)."""
+        return iter_latest_records(self.file_path)
+
+    def compact(self):
+        """Rewrites the data file keeping only the latest version of each slug."""
+        print(f"--- Compacting '{self.file_path}' ({self.line_count} lines, {len(self.slugs)} companies) ---")
+        self.close()
+        write_records_atomically(self.file_path, iter_latest_records(self.file_path))
+        self.slugs, self.line_count = {}, 0
+        self._load_index()
+        self._open_for_append()
+
+    def close(self):
+        for handle in (self._data_file, self._index_file):
+            if handle and not handle.closed: handle.close()
+#</editor-fold>
+
+#<editor-fold desc="Rewrites and Migration">
+
+def write_records_atomically(file_path, records):
+    """Writes records to a temp file, fsyncs and renames it over `file_path`, then rebuilds the slug index."""
+    temp_path = file_path + ".tmp"
+    index_entries = []
+    with open(temp_path, 'wb') as f:
+        for record in records:
+            f.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+            if record.get('company_slug'): index_entries.append((record['company_slug'], f.tell()))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, file_path)
+    index_temp_path = file_path + INDEX_SUFFIX + ".tmp"
+    with open(index_temp_path, 'w', encoding='utf-8') as f:
+        f.writelines(f"{slug}\t{offset}\n" for slug, offset in index_entries)
+    os.replace(index_temp_path, file_path + INDEX_SUFFIX)
+    return len(index_entries)
+
+def migrate_json_array(json_path, jsonl_path):
+    """One-shot conversion of the legacy `scraped_data.json` array into a JSONL store."""
+    if os.path.exists(jsonl_path):
+        print(f"'{jsonl_path}' already exists. Skipping migration from '{json_path}'.")
+        return 0
+    if not os.path.exists(json_path):
+        return 0
+    count = write_records_atomically(jsonl_path, iter_latest_records(json_path))
+    print(f"Migrated {count} companies from '{json_path}' to '{jsonl_path}'.")
+    return count
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintenance commands for the JSONL company record store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = subparsers.add_parser("migrate", help="Convert a legacy JSON array file into a JSONL store.")
+    migrate_parser.add_argument("json_path", nargs="?", default="scraped_data.json")
+    migrate_parser.add_argument("jsonl_path", nargs="?", default="scraped_data.jsonl")
+    compact_parser = subparsers.add_parser("compact", help="Drop superseded record versions from a JSONL store.")
+    compact_parser.add_argument("jsonl_path", nargs="?", default="scraped_data.jsonl")
+    args = parser.parse_args()
+    if args.command == "migrate":
+        migrate_json_array(args.json_path, args.jsonl_path)
+    else:
+        store = JsonlRecordStore(args.jsonl_path)
+        store.compact()
+        store.close()
@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import heapq
+import hashlib
+import argparse
+
+# --- Configuration ---
+REFRESH_STATE_FILE = "refresh_state.json"
+INITIAL_INTERVAL_DAYS = 30
+MIN_INTERVAL_DAYS = 7
+MAX_INTERVAL_DAYS = 180
+CHANGED_FACTOR = 0.5  # a changed record is re-checked twice as soon
+UNCHANGED_FACTOR = 1.5  # an unchanged record backs off
+METADATA_FIELDS = {"scraped_at", "content_hash", "hq_city", "hq_region", "hq_country"}  # bookkeeping and fields derived offline
+DAY = 86400
+
+#<editor-fold desc="Change Detection">
+
+def content_hash(record):
+    """Stable hash of a record's scraped content, ignoring bookkeeping fields."""
+    content = {k: v for k, v in record.items() if k not in METADATA_FIELDS}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+def stamp_record(record, scraped_at=None):
+    record["scraped_at"] = int(scraped_at if scraped_at is not None else time.time())
+    record["content_hash"] = content_hash(record)
+    return record
+#</editor-fold>
+
+#<editor-fold desc="Refresh Scheduler">
+
+class RefreshScheduler:
+    """Heap of slugs ordered by when they are next due for a re-fetch.
+
+    Each slug's re-check interval adapts to how often its content actually changed:
+    volatile companies converge towards MIN_INTERVAL_DAYS, stable ones towards
+    MAX_INTERVAL_DAYS. Superseded heap entries are skipped lazily on pop.
+    """
+
+    def __init__(self, state_path=REFRESH_STATE_FILE):
+        self.state_path = state_path
+        self.entries = {}  # slug -> {"scraped_at", "content_hash", "interval", "checks", "changes"}
+        self.heap = []
+        if os.path.exists(state_path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, slug):
+        return slug in self.entries
+
+    def _push(self, slug):
+        entry = self.entries[slug]
+        heapq.heappush(self.heap, (entry["scraped_at"] + entry["interval"], slug))
+
+    def track(self, record):
+        """Registers a record on first sight, using its own timestamp if it has one."""
+        slug = record["company_slug"]
+        if slug in self.entries: return
+        self.entries[slug] = {"scraped_at": record.get("scraped_at", 0), "content_hash": record.get("content_hash") or content_hash(record),
+                              "interval": INITIAL_INTERVAL_DAYS * DAY, "checks": 0, "changes": 0}
+        self._push(slug)
+
+    def observe(self, record):
+        """Records a fresh fetch; returns True when its content differs from the last one seen."""
+        slug = record["company_slug"]
+        if slug not in self.entries:
+            self.track(record)
+            return True
+        entry = self.entries[slug]
+        changed = record["content_hash"] != entry["content_hash"]
+        factor = CHANGED_FACTOR if changed else UNCHANGED_FACTOR
+        entry.update(scraped_at=record["scraped_at"], content_hash=record["content_hash"], checks=entry["checks"] + 1,
+                     changes=entry["changes"] + int(changed),
+                     interval=min(MAX_INTERVAL_DAYS * DAY, max(MIN_INTERVAL_DAYS * DAY, entry["interval"] * factor)))
+        self._push(slug)
+        return changed
+
+    def requeue(self, slug):
+        """Makes a slug whose re-fetch failed due again, keeping its schedule."""
+        if slug in self.entries: self._push(slug)
+
+    def _drop_stale_heads(self):
+        while self.heap:
+            due_at, slug = self.heap[0]
+            entry = self.entries.get(slug)
+            if entry and entry["scraped_at"] + entry["interval"] == due_at: return
+            heapq.heappop(self.heap)
+
+    def next_due(self, now=None):
+        """Pops the most overdue slug, or returns None when nothing is due yet."""
+        now = now if now is not None else time.time()
+        self._drop_stale_heads()
+        if not self.heap or self.heap[0][0] > now: return None
+        return heapq.heappop(self.heap)[1]
+
+    def due_count(self, now=None):
+        now = now if now is not None else time.time()
+        return sum(1 for e in self.entries.values() if e["scraped_at"] + e["interval"] <= now)
+
+    def load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Could not read refresh state {self.state_path}: {e}")
+            self.entries = {}
+        self.heap = [(e["scraped_at"] + e["interval"], slug) for slug, e in self.entries.items()]
+        heapq.heapify(self.heap)
+
+    def save(self):
+        temp_path = self.state_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(temp_path, self.state_path)
+        except IOError as e:
+            print(f"!!! Could not save refresh state to {self.state_path}: {e} !!!")
+#</editor-fold>
+
+def build_scheduler(records, state_path=REFRESH_STATE_FILE):
+    """Loads the persisted schedule, or seeds a new one from `records` (consumed lazily,
+    so an existing schedule never triggers a read of the whole corpus)."""
+    if os.path.exists(state_path):
+        return RefreshScheduler(state_path)
+    scheduler = RefreshScheduler(state_path)
+    for record in records:
+        if record.get("company_slug"): scheduler.track(record)
+    return scheduler
+
+if __name__ == "__main__":
+    from record_store import iter_latest_records
+    parser = argparse.ArgumentParser(description="Inspect the staleness-ordered refresh schedule.")
+    parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    refresh_scheduler = build_scheduler(iter_latest_records(args.data_file))
+    refresh_scheduler.save()
+    now = time.time()
+    print(f"{len(refresh_scheduler)} companies tracked, {refresh_scheduler.due_count(now)} due for refresh.")
+    for due_at, slug in heapq.nsmallest(args.top, refresh_scheduler.heap):
+        entry = refresh_scheduler.entries[slug]
+        print(f"{slug:<48} due {(due_at - now) / DAY:>+8.1f}d  interval {entry['interval'] / DAY:>6.1f}d  changes {entry['changes']}/{entry['checks']}")
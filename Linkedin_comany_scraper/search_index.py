@@ -0,0 +1,155 @@
+import sqlite3
+import argparse
+from record_store import iter_latest_records
+
+# --- Configuration ---
+SEARCH_DB_FILE = "company_search.db"
+FILTER_FIELDS = ["industry", "company_size", "headquarters"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS company_text (
+    id INTEGER PRIMARY KEY,
+    company_slug TEXT NOT NULL UNIQUE,
+    overview TEXT,
+    industry TEXT,
+    company_size TEXT,
+    headquarters TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_company_text_industry ON company_text(industry);
+CREATE INDEX IF NOT EXISTS idx_company_text_company_size ON company_text(company_size);
+CREATE INDEX IF NOT EXISTS idx_company_text_headquarters ON company_text(headquarters);
+CREATE VIRTUAL TABLE IF NOT EXISTS company_fts USING fts5(
+    overview,
+    content = 'company_text',
+    content_rowid = 'id',
+    tokenize = 'porter unicode61',
+    prefix = '2 3 4'
+);
+CREATE TRIGGER IF NOT EXISTS company_text_ai AFTER INSERT ON company_text BEGIN
+    INSERT INTO company_fts(rowid, overview) VALUES (new.id, new.overview);
+END;
+CREATE TRIGGER IF NOT EXISTS company_text_ad AFTER DELETE ON company_text BEGIN
+    INSERT INTO company_fts(company_fts, rowid, overview) VALUES ('delete', old.id, old.overview);
+END;
+CREATE TRIGGER IF NOT EXISTS company_text_au AFTER UPDATE ON company_text BEGIN
+    INSERT INTO company_fts(company_fts, rowid, overview) VALUES ('delete', old.id, old.overview);
+    INSERT INTO company_fts(rowid, overview) VALUES (new.id, new.overview);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO company_text (company_slug, overview, industry, company_size, headquarters) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(company_slug) DO UPDATE SET
+    overview = excluded.overview, industry = excluded.industry,
+    company_size = excluded.company_size, headquarters = excluded.headquarters
+"""
+
+#<editor-fold desc="Query Building">
+
+def build_match_query(keywords=None, phrase=None, prefix=None):
+    """Combines keyword, exact-phrase and prefix terms into one FTS5 MATCH expression."""
+    terms = []
+    for word in (keywords or "").split():
+        terms.append('"' + word.replace('"', '""') + '"')
+    if phrase:
+        terms.append('"' + phrase.replace('"', '""') + '"')
+    for word in (prefix or "").split():
+        terms.append('"' + word.replace('"', '""') + '"*')
+    return " AND ".join(terms)
+#</editor-fold>
+
+#<editor-fold desc="Search Index">
+
+class CompanySearchIndex:
+    """BM25-ranked full-text index over company overviews, backed by SQLite FTS5.
+
+    Overviews and filter fields live in an ordinary table keyed by slug; an external-content
+    FTS5 table is kept in sync by triggers, so re-adding a slug replaces its postings.
+    """
+
+    def __init__(self, db_path=SEARCH_DB_FILE):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM company_text").fetchone()[0]
+
+    def _upsert(self, record):
+        self.conn.execute(UPSERT_SQL, (record["company_slug"], record.get("overview") or "", *(record.get(field) for field in FILTER_FIELDS)))
+
+    def add(self, record):
+        if not record.get("company_slug"): return
+        with self.conn:
+            self._upsert(record)
+
+    def add_many(self, records):
+        count = 0
+        with self.conn:
+            for record in records:
+                if not record.get("company_slug"): continue
+                self._upsert(record)
+                count += 1
+        return count
+
+    def search(self, keywords=None, phrase=None, prefix=None, limit=20, **filters):
+        """Returns (slug, score, snippet) rows, best match first.
+
+        `filters` may restrict on industry, company_size or headquarters (exact match).
+        """
+        match = build_match_query(keywords, phrase, prefix)
+        if not match: return []
+        clauses, params = ["company_fts MATCH ?"], [match]
+        for field, value in filters.items():
+            if field not in FILTER_FIELDS: raise ValueError(f"Cannot filter on '{field}'.")
+            if value is None: continue
+            clauses.append(f"t.{field} = ?")
+            params.append(value)
+        sql = (f"SELECT t.company_slug, bm25(company_fts) AS score, snippet(company_fts, 0, '[', ']', '...', 12) "
+               f"FROM company_fts JOIN company_text t ON t.id = company_fts.rowid "
+               f"WHERE {' AND '.join(clauses)} ORDER BY score LIMIT ?")
+        return self.conn.execute(sql, (*params, limit)).fetchall()
+
+    def optimize(self):
+        with self.conn:
+            self.conn.execute("INSERT INTO company_fts(company_fts) VALUES ('optimize')")
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+#</editor-fold>
+
+def rebuild_index(data_file, db_path=SEARCH_DB_FILE):
+    index = CompanySearchIndex(db_path)
+    count = index.add_many(iter_latest_records(data_file))
+    index.optimize()
+    index.close()
+    print(f"Indexed {count} company overviews from '{data_file}' into '{db_path}'.")
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-text search over company overviews.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Index every record of a data file.")
+    build_parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    query_parser = subparsers.add_parser("query", help="Search the index.")
+    query_parser.add_argument("keywords", nargs="?", default=None)
+    query_parser.add_argument("--phrase")
+    query_parser.add_argument("--prefix")
+    query_parser.add_argument("--industry")
+    query_parser.add_argument("--company-size")
+    query_parser.add_argument("--headquarters")
+    query_parser.add_argument("--limit", type=int, default=20)
+    for sub in (build_parser, query_parser): sub.add_argument("--db", default=SEARCH_DB_FILE)
+    args = parser.parse_args()
+    if args.command == "build":
+        rebuild_index(args.data_file, args.db)
+    else:
+        search_index = CompanySearchIndex(args.db)
+        rows = search_index.search(args.keywords, args.phrase, args.prefix, args.limit,
+                                   industry=args.industry, company_size=args.company_size, headquarters=args.headquarters)
+        for slug, score, snippet in rows:
+            print(f"{score:>8.2f}  {slug:<40}  {snippet}")
+        search_index.close()
@@ -0,0 +1,286 @@
+import os
+import re
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import svds
+from record_store import iter_latest_records
+
+# --- Configuration ---
+EMBEDDINGS_FILE = "company_embeddings.npy"  # float32 rows, opened memory-mapped
+EMBEDDING_MODEL_FILE = "company_embeddings_model.npz"  # vocabulary, idf weights and SVD components
+EMBEDDING_SLUGS_FILE = "company_embeddings.slugs"  # one slug per line; line number = matrix row
+EMBEDDING_LOCK_FILE = "company_embeddings.lock"  # holds the pid of the process folding rows in; `build` refuses to run while it exists
+EMBEDDING_DIM = 128
+MIN_DOCUMENT_FREQUENCY = 2
+MAX_DOCUMENT_RATIO = 0.5  # terms in more than half of all overviews carry no signal
+MAX_FEATURES = 50000
+BUILD_CHUNK_SIZE = 2000
+SEARCH_BLOCK_ROWS = 65536  # rows scored per matrix multiply; bounds memory whatever the corpus size
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9+#]+")
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to we with you your
+all also any can more most not other over such than them they these those through us was were which who will
+""".split())
+
+#<editor-fold desc="TF-IDF Vectorization">
+
+def tokenize(text):
+    return [word for word in WORD_PATTERN.findall((text or "").lower()) if word not in STOP_WORDS]
+
+def _document_frequencies(texts):
+    frequencies = Counter()
+    for text in texts: frequencies.update(set(tokenize(text)))
+    return frequencies
+
+def _term_counts(texts, vocabulary):
+    """Sparse rows of raw term counts over a fixed vocabulary; unknown terms are dropped."""
+    indptr, indices, counts = [0], [], []
+    for text in texts:
+        row = Counter(vocabulary[word] for word in tokenize(text) if word in vocabulary)
+        indices.extend(row.keys())
+        counts.extend(row.values())
+        indptr.append(len(indices))
+    return sp.csr_matrix((np.array(counts, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+                         shape=(len(texts), len(vocabulary)))
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+def tfidf(counts, idf):
+    """Sublinear tf (1 + log count) times idf, each row L2-normalized."""
+    weighted = counts.copy()
+    weighted.data = 1.0 + np.log(weighted.data)
+    weighted = (weighted @ sp.diags(idf)).tocsr()
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    return (sp.diags(np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)) @ weighted).tocsr()
+#</editor-fold>
+
+#<editor-fold desc="Model Fitting">
+
+def fit_embeddings(data_file, dim=EMBEDDING_DIM, workers=None, embeddings_path=EMBEDDINGS_FILE,
+                   model_path=EMBEDDING_MODEL_FILE, slugs_path=EMBEDDING_SLUGS_FILE, lock_path=EMBEDDING_LOCK_FILE):
+    """Fits TF-IDF + truncated SVD on every stored overview and writes the embedding matrix from scratch.
+
+    Both passes over the text (document frequencies, then term counts) run in a process pool,
+    one chunk of BUILD_CHUNK_SIZE overviews per task. Run it while the scraper is stopped: a
+    running scraper keeps folding rows into the matrix it opened, and would append their slugs
+    to the rebuilt slugs file, so the build refuses to start while the index lock file exists.
+    """
+    if os.path.exists(lock_path):
+        with open(lock_path, 'r', encoding='utf-8') as f: holder = f.read().strip()
+        print(f"!!! Embedding index is open for writing (pid {holder or '?'}, '{lock_path}'). Stop the scraper first, "
+              f"or delete the lock file if that process is no longer running. !!!")
+        return 0
+    slugs, texts = [], []
+    for record in iter_latest_records(data_file):
+        if record.get("company_slug") and record.get("overview"):
+            slugs.append(record["company_slug"])
+            texts.append(record["overview"])
+    if len(texts) < 3:
+        print(f"!!! Only {len(texts)} overviews in '{data_file}'; not enough to fit embeddings. !!!")
+        return 0
+    chunks = [texts[i:i + BUILD_CHUNK_SIZE] for i in range(0, len(texts), BUILD_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frequencies = sum(pool.map(_document_frequencies, chunks), Counter())
+        n = len(texts)
+        kept = [(df, term) for term, df in frequencies.items() if MIN_DOCUMENT_FREQUENCY <= df <= MAX_DOCUMENT_RATIO * n]
+        terms = sorted(term for _, term in sorted(kept, key=lambda item: (-item[0], item[1]))[:MAX_FEATURES])
+        vocabulary = {term: i for i, term in enumerate(terms)}
+        counts = sp.vstack(list(pool.map(partial(_term_counts, vocabulary=vocabulary), chunks)), format="csr")
+    idf = (np.log((1 + n) / (1 + np.array([frequencies[term] for term in terms], dtype=np.float64))) + 1).astype(np.float32)
+    weighted = tfidf(counts, idf)
+
+    k = min(dim, min(weighted.shape) - 1)
+    _, singular_values, components = svds(weighted, k=k, v0=np.full(min(weighted.shape), 1.0 / min(weighted.shape)))
+    components = components[np.argsort(-singular_values)].astype(np.float32)
+    embeddings = _normalize_rows((weighted @ components.T).astype(np.float32))
+
+    np.savez(model_path + ".tmp.npz", vocabulary=np.array(terms), idf=idf, components=components)
+    os.replace(model_path + ".tmp.npz", model_path)
+    matrix = np.lib.format.open_memmap(embeddings_path + ".tmp", mode="w+", dtype=np.float32, shape=embeddings.shape)
+    matrix[:] = embeddings
+    matrix.flush()
+    del matrix
+    os.replace(embeddings_path + ".tmp", embeddings_path)
+    with open(slugs_path + ".tmp", 'w', encoding='utf-8') as f:
+        f.writelines(f"{slug}\n" for slug in slugs)
+    os.replace(slugs_path + ".tmp", slugs_path)
+    print(f"Embedded {len(slugs)} overviews: {len(terms)} terms -> {k} dimensions.")
+    return len(slugs)
+#</editor-fold>
+
+#<editor-fold desc="Embedding Index">
+
+class EmbeddingIndex:
+    """Memory-mapped company embeddings with blocked cosine top-k search and incremental fold-in.
+
+    New or refreshed overviews are projected with the stored vocabulary, idf and SVD
+    components (no refit) and written into the matrix in place. The `.npy` is allocated with
+    spare rows and doubled when full, so appends are amortized O(1); the slugs file is only
+    appended after the vector is flushed. Refit with `python similarity.py build` once many
+    companies have been folded in, so new vocabulary is picked up. Only one writable index may
+    be open at a time: it holds EMBEDDING_LOCK_FILE until it is closed.
+    """
+
+    def __init__(self, embeddings_path=EMBEDDINGS_FILE, model_path=EMBEDDING_MODEL_FILE, slugs_path=EMBEDDING_SLUGS_FILE,
+                 writable=False, lock_path=EMBEDDING_LOCK_FILE):
+        self.embeddings_path = embeddings_path
+        self.slugs_path = slugs_path
+        self.writable = writable
+        self.lock_path = lock_path
+        self._owns_lock = False
+        with np.load(model_path) as model:
+            self.vocabulary = {term: i for i, term in enumerate(model["vocabulary"].tolist())}
+            self.idf = model["idf"]
+            self.components = model["components"]
+        with open(slugs_path, 'r', encoding='utf-8') as f:
+            self.slugs = [line.rstrip('\n') for line in f if line.strip()]
+        self.rows = {slug: row for row, slug in enumerate(self.slugs)}
+        self.matrix = np.load(embeddings_path, mmap_mode="r+" if writable else "r")
+        if len(self.slugs) > self.matrix.shape[0]:
+            raise ValueError(f"'{slugs_path}' lists {len(self.slugs)} slugs but '{embeddings_path}' has only {self.matrix.shape[0]} rows "
+                             f"(rebuilt while the scraper was running?). Run 'python similarity.py build' again with the scraper stopped.")
+        if writable: self._acquire_lock()
+
+    def _acquire_lock(self):
+        """Creates the lock file atomically; a second writer (scraper, `update`) is refused, not let in."""
+        try:
+            fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            with open(self.lock_path, 'r', encoding='utf-8') as f: holder = f.read().strip()
+            raise ValueError(f"'{self.lock_path}' shows the index is already open for writing (pid {holder or '?'}). "
+                             f"Stop that process first, or delete the lock file if it is no longer running.") from None
+        with os.fdopen(fd, 'w', encoding='utf-8') as f: f.write(f"{os.getpid()}\n")
+        self._owns_lock = True
+
+    @classmethod
+    def open_if_built(cls, **kwargs):
+        if not os.path.exists(kwargs.get("model_path", EMBEDDING_MODEL_FILE)):
+            print("No embedding model yet; run 'python similarity.py build' to enable similar-company search.")
+            return None
+        try:
+            return cls(writable=True, **kwargs)
+        except ValueError as e:
+            print(f"!!! Embedding index not opened: {e} !!!")
+            return None
+
+    def __len__(self):
+        return len(self.slugs)
+
+    def __contains__(self, slug):
+        return slug in self.rows
+
+    def embed(self, texts):
+        counts = _term_counts(texts, self.vocabulary)
+        return _normalize_rows((tfidf(counts, self.idf) @ self.components.T).astype(np.float32))
+
+    def _grow(self, needed_rows):
+        capacity = max(needed_rows, 2 * self.matrix.shape[0])
+        grown = np.lib.format.open_memmap(self.embeddings_path + ".tmp", mode="w+", dtype=np.float32, shape=(capacity, self.matrix.shape[1]))
+        for start in range(0, self.matrix.shape[0], SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, self.matrix.shape[0])
+            grown[start:end] = self.matrix[start:end]
+        grown.flush()
+        del grown
+        del self.matrix
+        os.replace(self.embeddings_path + ".tmp", self.embeddings_path)
+        self.matrix = np.load(self.embeddings_path, mmap_mode="r+")
+
+    def add_many(self, records):
+        """Folds in overviews; a slug that is already indexed has its row overwritten."""
+        records = [r for r in records if r.get("company_slug") and r.get("overview")]
+        if not records: return 0
+        if not self.writable: raise ValueError("Index was opened read-only.")
+        vectors = self.embed([r["overview"] for r in records])
+        new_slugs = []
+        for record, vector in zip(records, vectors):
+            slug = record["company_slug"]
+            if slug not in self.rows:
+                self.rows[slug] = len(self.slugs) + len(new_slugs)
+                new_slugs.append(slug)
+            if self.rows[slug] >= self.matrix.shape[0]: self._grow(self.rows[slug] + 1)
+            self.matrix[self.rows[slug]] = vector
+        self.matrix.flush()
+        if new_slugs:
+            with open(self.slugs_path, 'a', encoding='utf-8') as f:
+                f.writelines(f"{slug}\n" for slug in new_slugs)
+            self.slugs.extend(new_slugs)
+        return len(records)
+
+    def add(self, record):
+        return self.add_many([record])
+
+    def search(self, queries, k=10, exclude_rows=None):
+        """Top-k cosine matches for each query row, scanning the matrix SEARCH_BLOCK_ROWS rows at a time.
+
+        Returns (rows, scores), both shaped (len(queries), k), best first.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self.slugs))
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self.slugs), SEARCH_BLOCK_ROWS):
+            block = np.asarray(self.matrix[start:min(start + SEARCH_BLOCK_ROWS, len(self.slugs))])
+            scores = queries @ block.T
+            if exclude_rows is not None:
+                for query, row in enumerate(exclude_rows):
+                    if start <= row < start + len(block): scores[query, row - start] = -np.inf
+            rows = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            keep = np.argpartition(-scores, k - 1, axis=1)[:, :k] if scores.shape[1] > k else np.argsort(-scores, axis=1)
+            best_scores = np.take_along_axis(scores, keep, axis=1)
+            best_rows = np.take_along_axis(rows, keep, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_rows, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+    def similar(self, slug, k=10):
+        """[(slug, cosine)] of the companies whose overviews are closest to `slug`'s."""
+        if slug not in self.rows: return []
+        row = self.rows[slug]
+        rows, scores = self.search(self.matrix[row], k, exclude_rows=[row])
+        return [(self.slugs[r], float(s)) for r, s in zip(rows[0], scores[0]) if np.isfinite(s)]
+
+    def close(self):
+        if self.writable:
+            self.matrix.flush()
+            if self._owns_lock: os.remove(self.lock_path)
+            self._owns_lock = False
+        del self.matrix
+#</editor-fold>
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TF-IDF/SVD company embeddings and similar-company search.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Fit the vocabulary and SVD on all overviews and embed them (run while the scraper is stopped).")
+    build_parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    build_parser.add_argument("--dim", type=int, default=EMBEDDING_DIM)
+    build_parser.add_argument("--workers", type=int, default=None)
+    update_parser = subparsers.add_parser("update", help="Fold in companies that are not embedded yet, without refitting.")
+    update_parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    similar_parser = subparsers.add_parser("similar", help="Companies with the most similar overviews.")
+    similar_parser.add_argument("slug")
+    similar_parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        fit_embeddings(args.data_file, args.dim, args.workers)
+    elif args.command == "update":
+        try:
+            index = EmbeddingIndex(writable=True)
+        except ValueError as e:
+            parser.exit(1, f"!!! {e} !!!\n")
+        added = index.add_many(r for r in iter_latest_records(args.data_file) if r.get("company_slug") not in index)
+        print(f"Folded {added} new companies into the embedding index ({len(index)} total).")
+        index.close()
+    else:
+        index = EmbeddingIndex()
+        matches = index.similar(args.slug, args.top)
+        if not matches: print(f"'{args.slug}' has no embedded overview.")
+        for match_slug, score in matches:
+            print(f"{match_slug:<48}{score:.4f}")
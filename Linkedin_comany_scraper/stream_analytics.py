@@ -0,0 +1,233 @@
+import os
+import re
+import json
+import math
+import random
+import argparse
+from collections import Counter
+from multiprocessing import Pool
+import ijson
+from field_patterns import COMPANY_SIZE_PATTERN, parse_follower_count
+from record_store import INDEX_SUFFIX
+
+# --- Configuration ---
+TRACKED_FIELDS = ["followers", "overview", "website", "industry", "company_size", "headquarters", "job_openings_text"]
+HEAVY_HITTER_CAPACITY = 200  # Misra-Gries counters; every value above N/200 occurrences is kept
+QUANTILE_SKETCH_K = 200  # KLL compactor size; rank error is roughly 1.7/k
+COMPANY_SIZE_RE = re.compile(COMPANY_SIZE_PATTERN)
+
+#<editor-fold desc="Mergeable Sketches">
+
+class MisraGries:
+    """Heavy-hitters summary: at most `capacity` counters, counts under-estimated by at most N/capacity."""
+
+    def __init__(self, capacity=HEAVY_HITTER_CAPACITY):
+        self.capacity = capacity
+        self.counters = {}
+        self.total = 0
+
+    def add(self, item):
+        self.total += 1
+        if item in self.counters:
+            self.counters[item] += 1
+        elif len(self.counters) < self.capacity:
+            self.counters[item] = 1
+        else:
+            for key in list(self.counters):
+                self.counters[key] -= 1
+                if self.counters[key] == 0: del self.counters[key]
+
+    def merge(self, other):
+        combined = Counter(self.counters) + Counter(other.counters)
+        if len(combined) > self.capacity:
+            cut = sorted(combined.values(), reverse=True)[self.capacity]
+            combined = Counter({k: v - cut for k, v in combined.items() if v > cut})
+        self.counters = dict(combined)
+        self.total += other.total
+        return self
+
+    def top(self, k):
+        return sorted(self.counters.items(), key=lambda item: -item[1])[:k]
+
+class KllSketch:
+    """Streaming quantile sketch (KLL): compactors of geometrically shrinking capacity.
+
+    Memory stays O(k log(N/k)) and two sketches merge by concatenating their levels.
+    """
+
+    def __init__(self, k=QUANTILE_SKETCH_K, seed=None):
+        self.k = k
+        self.levels = [[]]
+        self.count = 0
+        self.rng = random.Random(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def add(self, value):
+        self.levels[0].append(value)
+        self.count += 1
+        self._compress()
+
+    def _compress(self):
+        """Halves every overfull level: sorts it and promotes every other item (random parity) with double weight."""
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) >= self._capacity(level):
+                if level + 1 == len(self.levels): self.levels.append([])
+                items = sorted(self.levels[level])
+                leftover = [items.pop()] if len(items) % 2 else []
+                self.levels[level + 1].extend(items[self.rng.randint(0, 1)::2])
+                self.levels[level] = leftover
+            level += 1
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels): self.levels.append([])
+        for level, items in enumerate(other.levels): self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        if not weighted: return None
+        total = sum(weight for _, weight in weighted)
+        target, seen = q * total, 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target: return value
+        return weighted[-1][0]
+#</editor-fold>
+
+#<editor-fold desc="Streaming Sources">
+
+def stream_json_array(file_path):
+    """Yields records from the legacy array file one at a time with ijson."""
+    with open(file_path, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
+def latest_line_ends(file_path):
+    """End offsets of each slug's latest line, from the store's `.slugs` sidecar; None when there is no sidecar."""
+    index_path = file_path + INDEX_SUFFIX
+    if not os.path.exists(index_path): return None
+    ends = {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) == 2 and parts[1].isdigit(): ends[parts[0]] = int(parts[1])
+    return set(ends.values())
+
+def stream_jsonl(file_path, start=0, end=None, latest_ends=None):
+    """Yields records from the JSONL lines that start within [start, end).
+
+    With `latest_ends`, lines covered by the index that are not some slug's latest version
+    are skipped; lines appended after the last indexed one are always kept.
+    """
+    indexed_end = max(latest_ends, default=0) if latest_ends is not None else 0
+    with open(file_path, 'rb') as f:
+        if start:
+            f.seek(start - 1)
+            f.readline()  # finish the line that straddles the chunk boundary
+        while end is None or f.tell() < end:
+            line = f.readline()
+            if not line: break
+            if not line.endswith(b'\n'): break
+            if indexed_end and f.tell() <= indexed_end and f.tell() not in latest_ends: continue
+            try: yield json.loads(line)
+            except json.JSONDecodeError: continue
+
+def stream_records(file_path, latest_ends=None):
+    return stream_json_array(file_path) if file_path.endswith(".json") else stream_jsonl(file_path, latest_ends=latest_ends)
+#</editor-fold>
+
+#<editor-fold desc="Pipeline Stages">
+
+def with_parsed_numbers(records):
+    for record in records:
+        record["_followers"] = parse_follower_count(record.get("followers"))
+        yield record
+
+class CorpusStats:
+    def __init__(self):
+        self.records = 0
+        self.industries = Counter()
+        self.company_sizes = Counter()
+        self.field_coverage = Counter()
+        self.headquarters = MisraGries()
+        self.followers = KllSketch()
+
+    def consume(self, records):
+        for record in records:
+            self.records += 1
+            self.industries[record.get("industry") or "(missing)"] += 1
+            self.company_sizes[record.get("company_size") or "(missing)"] += 1
+            for field in TRACKED_FIELDS:
+                if record.get(field): self.field_coverage[field] += 1
+            if record.get("headquarters"): self.headquarters.add(record["headquarters"])
+            if record["_followers"] is not None: self.followers.add(record["_followers"])
+        return self
+
+    def merge(self, other):
+        self.records += other.records
+        self.industries.update(other.industries)
+        self.company_sizes.update(other.company_sizes)
+        self.field_coverage.update(other.field_coverage)
+        self.headquarters.merge(other.headquarters)
+        self.followers.merge(other.followers)
+        return self
+
+def _size_sort_key(label):
+    match = COMPANY_SIZE_RE.search(label)
+    return int(match.group("lower").replace(',', '')) if match else -1
+
+def analyze_chunk(args):
+    file_path, start, end = args
+    return CorpusStats().consume(with_parsed_numbers(stream_jsonl(file_path, start, end, latest_line_ends(file_path))))
+
+def analyze(file_path, workers=1):
+    """One pass; memory beyond the sketches is one offset per company. JSONL files can be split
+    into byte ranges across `workers` processes.
+
+    Superseded versions of refreshed companies are skipped using the store's `.slugs` sidecar;
+    without one, every line is counted until the store is compacted.
+    """
+    if not file_path.endswith(".json") and latest_line_ends(file_path) is None:
+        print(f"No '{file_path}{INDEX_SUFFIX}' index: superseded versions of refreshed companies are counted too.")
+    if workers <= 1 or file_path.endswith(".json"):
+        latest_ends = None if file_path.endswith(".json") else latest_line_ends(file_path)
+        return CorpusStats().consume(with_parsed_numbers(stream_records(file_path, latest_ends)))
+    size = os.path.getsize(file_path)
+    bounds = [size * i // workers for i in range(workers + 1)]
+    ranges = [(file_path, bounds[i], bounds[i + 1]) for i in range(workers)]
+    with Pool(workers) as pool:
+        partials = pool.map(analyze_chunk, ranges)
+    stats = partials[0]
+    for partial in partials[1:]: stats.merge(partial)
+    return stats
+#</editor-fold>
+
+def print_stats(stats, top):
+    print(f"--- {stats.records} companies ---")
+    print("\nIndustries:")
+    for industry, count in stats.industries.most_common(top): print(f"  {industry:<56}{count:>8}")
+    print("\nCompany sizes:")
+    for size, count in sorted(stats.company_sizes.items(), key=lambda item: _size_sort_key(item[0])): print(f"  {size:<56}{count:>8}")
+    print(f"\nTop headquarters (approximate, error <= {stats.headquarters.total // stats.headquarters.capacity}):")
+    for hq, count in stats.headquarters.top(top): print(f"  {hq:<56}{count:>8}")
+    print("\nField coverage:")
+    for field in TRACKED_FIELDS:
+        share = stats.field_coverage[field] / stats.records if stats.records else 0.0
+        print(f"  {field:<56}{share:>8.1%}")
+    print("\nFollower quantiles (approximate):")
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+        value = stats.followers.quantile(q)
+        print(f"  p{int(q * 100):<55}{'n/a' if value is None else int(value):>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-pass, bounded-memory statistics over the scraped corpus.")
+    parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    parser.add_argument("--workers", type=int, default=1, help="Processes to split a JSONL file across.")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    print_stats(analyze(args.data_file, args.workers), args.top)
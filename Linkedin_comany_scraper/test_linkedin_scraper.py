@@ -0,0 +1,86 @@
+import os
+import json
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+import linkedin_scraper
+from refresh_scheduler import stamp_record
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+def fake_company(driver, wait, company_slug, page_archive=None):
+    return {"company_slug": company_slug, "followers": "1,200 followers", "overview": f"{company_slug} builds cloud software.",
+            "industry": "Software Development", "headquarters": "Redmond, Washington", "job_openings_text": "12 job openings"}
+
+class MainLoopTest(unittest.TestCase):
+    """Runs `main()` against a fake driver in a scratch directory, starting with no stored data."""
+
+    def setUp(self):
+        self.previous_dir = os.getcwd()
+        self.work_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.work_dir.name)
+        with open(linkedin_scraper.CREDENTIALS_FILE, 'w', encoding='utf-8') as f:
+            json.dump([{"username": "test@example.com", "password": "secret"}], f)
+
+    def tearDown(self):
+        os.chdir(self.previous_dir)
+        self.work_dir.cleanup()
+
+    def run_main(self, companies=3, company=fake_company):
+        slugs = iter(f"company-{i}" for i in range(1000))
+        with mock.patch.multiple(linkedin_scraper, MAX_NEW_COMPANIES=companies, EMBED_OVERVIEWS=False, ARCHIVE_PAGES=False,
+                                 login_and_setup_driver=lambda credential, proxy: (FakeDriver(), None),
+                                 find_first_new_company_on_page=lambda *args: next(slugs),
+                                 scrape_company_data=company,
+                                 discover_new_companies=lambda *args: None,
+                                 perform_curiosity_click=lambda *args: None), \
+             mock.patch("time.sleep"):
+            linkedin_scraper.main()
+
+    def test_search_index_built_from_empty(self):
+        self.run_main()
+        with sqlite3.connect(linkedin_scraper.SEARCH_DB_FILE) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM company_text").fetchone()[0], 3)
+
+    def test_timeseries_written_from_empty_store(self):
+        from timeseries import TimeSeriesStore
+        self.run_main()
+        store = TimeSeriesStore(linkedin_scraper.TIMESERIES_DIR)
+        history = store.history("company-1")
+        store.close()
+        self.assertEqual(len(store), 3)
+        self.assertEqual((int(history["followers"][0]), int(history["job_openings"][0])), (1200, 12))
+
+    def test_refresh_schedule_tracks_companies_from_empty_state(self):
+        with open(linkedin_scraper.REFRESH_STATE_FILE, 'w', encoding='utf-8') as f: f.write("{}")
+        self.run_main()
+        with open(linkedin_scraper.REFRESH_STATE_FILE, 'r', encoding='utf-8') as f:
+            self.assertEqual(sorted(json.load(f)), ["company-0", "company-1", "company-2"])
+
+    def test_partial_refresh_keeps_stored_fields(self):
+        def partial_refresh(driver, wait, company_slug, page_archive=None):
+            record = fake_company(driver, wait, company_slug, page_archive)
+            if company_slug == "stored-co":
+                del record["overview"]  # the overview lookup timed out
+                record["followers"] = "1,300 followers"
+            return record
+        for backend in ("jsonl", "sqlite"):
+            with self.subTest(backend=backend), mock.patch.object(linkedin_scraper, "STORAGE_BACKEND", backend):
+                store = linkedin_scraper.load_existing_data(linkedin_scraper.DATA_FILE)
+                store.append(stamp_record({**fake_company(None, None, "stored-co"), "website": "https://stored.example"}, scraped_at=0))
+                store.close()
+                self.run_main(companies=5, company=partial_refresh)
+                store = linkedin_scraper.load_existing_data(linkedin_scraper.DATA_FILE)
+                stored = store.get("stored-co")
+                store.close()
+                self.assertEqual(stored["followers"], "1,300 followers")  # the refresh was written
+                self.assertEqual(stored["overview"], "stored-co builds cloud software.")
+                self.assertEqual(stored["website"], "https://stored.example")
+                for path in (linkedin_scraper.DATA_FILE, linkedin_scraper.DATA_FILE + ".slugs", linkedin_scraper.DB_FILE, linkedin_scraper.REFRESH_STATE_FILE):
+                    if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+import os
+import re
+import time
+import glob
+import argparse
+import numpy as np
+from record_store import iter_records
+from field_patterns import JOB_OPENINGS_PATTERN, parse_follower_count
+
+# --- Configuration ---
+TIMESERIES_DIR = "company_timeseries"
+CHUNK_ROWS = 65536  # observations per sealed chunk
+MISSING = -1  # follower / job-opening value that could not be parsed
+DAY = 86400
+OBSERVATION_DTYPE = np.dtype([("slug_id", "<i4"), ("ts", "<i8"), ("followers", "<i8"), ("job_openings", "<i8")])
+METRICS = ["followers", "job_openings"]
+JOB_OPENINGS_RE = re.compile(JOB_OPENINGS_PATTERN)
+
+#<editor-fold desc="Parsing and Delta Encoding">
+
+def parse_counts(record):
+    """(followers, job_openings) as integers, MISSING where the text could not be parsed."""
+    followers = parse_follower_count(record.get("followers"))
+    jobs = JOB_OPENINGS_RE.search(record.get("job_openings_text") or "")
+    return (followers if followers is not None else MISSING,
+            int(jobs.group("count").replace(',', '')) if jobs else MISSING)
+
+def _segment_starts(slug_ids):
+    return np.flatnonzero(np.r_[True, slug_ids[1:] != slug_ids[:-1]]) if len(slug_ids) else np.zeros(0, dtype=np.int64)
+
+def encode_chunk(observations):
+    """Sorts by (slug, time) and stores one run per slug: the slug ID and run length, then per-field deltas.
+
+    The first value of every run is stored as-is, so each run decodes independently.
+    """
+    observations = np.sort(observations, order=["slug_id", "ts"])
+    starts = _segment_starts(observations["slug_id"])
+    encoded = {"run_slug_ids": observations["slug_id"][starts], "run_lengths": np.diff(np.r_[starts, len(observations)]).astype(np.int32)}
+    for field in ("ts", *METRICS):
+        deltas = np.diff(observations[field], prepend=0)
+        deltas[starts] = observations[field][starts]
+        encoded[field] = deltas
+    return encoded
+
+def decode_chunk(encoded):
+    lengths = encoded["run_lengths"]
+    observations = np.empty(int(lengths.sum()), dtype=OBSERVATION_DTYPE)
+    observations["slug_id"] = np.repeat(encoded["run_slug_ids"], lengths)
+    starts = np.r_[0, np.cumsum(lengths)[:-1]].astype(np.int64)
+    for field in ("ts", *METRICS):
+        totals = np.cumsum(encoded[field])
+        before_run = totals[starts] - encoded[field][starts] if len(starts) else totals[:0]
+        observations[field] = totals - np.repeat(before_run, lengths)
+    return observations
+#</editor-fold>
+
+#<editor-fold desc="Time-Series Store">
+
+class TimeSeriesStore:
+    """Append-only (timestamp, followers, job openings) history for every company.
+
+    New observations are appended as fixed-width rows to `active.bin`; every CHUNK_ROWS rows
+    they are sealed into a delta-encoded, compressed `chunk_NNNNN.npz`. `slugs.tsv` assigns
+    each slug an integer ID (its first line) and records its latest industry (its last line).
+    """
+
+    def __init__(self, directory=TIMESERIES_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.active_path = os.path.join(directory, "active.bin")
+        self.slugs_path = os.path.join(directory, "slugs.tsv")
+        self.slug_ids, self.slugs, self.industries = {}, [], []
+        self._load_slugs()
+        self._active_rows = self._trim_active()
+        self._active = open(self.active_path, 'ab')
+        self._slugs_file = open(self.slugs_path, 'a', encoding='utf-8')
+
+    def __len__(self):
+        return len(self.slugs)
+
+    def __contains__(self, slug):
+        return slug in self.slug_ids
+
+    def _load_slugs(self):
+        if not os.path.exists(self.slugs_path): return
+        with open(self.slugs_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'): break
+                slug, _, industry = line.rstrip('\n').partition('\t')
+                if slug not in self.slug_ids:
+                    self.slug_ids[slug] = len(self.slugs)
+                    self.slugs.append(slug)
+                    self.industries.append(None)
+                self.industries[self.slug_ids[slug]] = industry or None
+
+    def _trim_active(self):
+        """Drops a torn trailing row left by a crash mid-append."""
+        if not os.path.exists(self.active_path): return 0
+        size = os.path.getsize(self.active_path)
+        rows, torn = divmod(size, OBSERVATION_DTYPE.itemsize)
+        if torn:
+            with open(self.active_path, 'r+b') as f: f.truncate(rows * OBSERVATION_DTYPE.itemsize)
+        return rows
+
+    def _slug_id(self, slug, industry):
+        slug_id = self.slug_ids.get(slug)
+        is_new = slug_id is None
+        if is_new:
+            slug_id = self.slug_ids[slug] = len(self.slugs)
+            self.slugs.append(slug)
+            self.industries.append(None)
+        if is_new or industry != self.industries[slug_id]:
+            self._slugs_file.write(f"{slug}\t{industry or ''}\n")
+            self._slugs_file.flush()
+            self.industries[slug_id] = industry
+        return slug_id
+
+    def append(self, slug, ts, followers, job_openings, industry=None):
+        row = np.array([(self._slug_id(slug, industry), ts, followers, job_openings)], dtype=OBSERVATION_DTYPE)
+        self._active.write(row.tobytes())
+        self._active.flush()
+        self._active_rows += 1
+        if self._active_rows >= CHUNK_ROWS: self._seal()
+
+    def record(self, record):
+        """Appends one observation from a scraped (and stamped) company record."""
+        followers, job_openings = parse_counts(record)
+        self.append(record["company_slug"], int(record.get("scraped_at") or time.time()), followers, job_openings, record.get("industry"))
+
+    def _chunk_paths(self):
+        return sorted(glob.glob(os.path.join(self.directory, "chunk_*.npz")))
+
+    def _seal(self):
+        self._active.close()
+        observations = np.fromfile(self.active_path, dtype=OBSERVATION_DTYPE)
+        chunk_path = os.path.join(self.directory, f"chunk_{len(self._chunk_paths()):05d}.npz")
+        np.savez_compressed(chunk_path + ".tmp.npz", **encode_chunk(observations))
+        os.replace(chunk_path + ".tmp.npz", chunk_path)
+        open(self.active_path + ".tmp", 'wb').close()
+        os.replace(self.active_path + ".tmp", self.active_path)
+        self._active = open(self.active_path, 'ab')
+        self._active_rows = 0
+
+    def observations(self):
+        """Every observation, sorted by (slug ID, timestamp) with duplicates removed."""
+        parts = []
+        for chunk_path in self._chunk_paths():
+            with np.load(chunk_path) as encoded: parts.append(decode_chunk(encoded))
+        self._active.flush()
+        parts.append(np.fromfile(self.active_path, dtype=OBSERVATION_DTYPE, count=self._active_rows))
+        return np.unique(np.concatenate(parts))
+
+    def history(self, slug):
+        if slug not in self.slug_ids: return np.empty(0, dtype=OBSERVATION_DTYPE)
+        observations = self.observations()
+        return observations[observations["slug_id"] == self.slug_ids[slug]]
+
+    def close(self):
+        for handle in (self._active, self._slugs_file):
+            if not handle.closed: handle.close()
+#</editor-fold>
+
+#<editor-fold desc="Trend Queries">
+
+def top_growth_by_industry(store, metric="followers", window_days=90, top=10, relative=False, now=None):
+    """Fastest-growing companies per industry over the last `window_days`.
+
+    Growth is the change between each company's first and last observation inside the
+    window (relative to the first value with `relative=True`); companies with fewer than
+    two usable observations are skipped. Returns {industry: [(slug, first, last, growth)]}.
+    """
+    now = now if now is not None else time.time()
+    observations = store.observations()
+    observations = observations[(observations["ts"] >= now - window_days * DAY) & (observations[metric] != MISSING)]
+    slug_ids = observations["slug_id"]
+    starts = _segment_starts(slug_ids)
+    ends = np.r_[starts[1:], len(observations)] - 1
+    repeated = ends > starts
+    starts, ends = starts[repeated], ends[repeated]
+    first, last = observations[metric][starts], observations[metric][ends]
+    growth = (last - first) / np.maximum(first, 1) if relative else (last - first).astype(np.float64)
+
+    industry_names = sorted({industry for industry in store.industries if industry})
+    name_codes = {name: code for code, name in enumerate(industry_names)}
+    industry_codes = np.array([name_codes.get(industry, -1) for industry in store.industries], dtype=np.int32)
+    codes = industry_codes[slug_ids[starts]]
+    order = np.lexsort((-growth, codes))
+    codes_sorted = codes[order]
+    group_starts = _segment_starts(codes_sorted)
+    rank = np.arange(len(order)) - np.repeat(group_starts, np.diff(np.r_[group_starts, len(order)]))
+    selected = order[(rank < top) & (codes_sorted >= 0)]
+
+    result = {}
+    for i in selected:
+        result.setdefault(industry_names[codes[i]], []).append(
+            (store.slugs[slug_ids[starts[i]]], int(first[i]), int(last[i]), float(growth[i])))
+    return result
+#</editor-fold>
+
+def seed_from_data_file(store, data_file):
+    """Loads one observation per stored record version, so refreshed companies start with their history.
+
+    Records from before `scraped_at` stamping are dated with the data file's modification time.
+    """
+    if len(store):
+        print(f"Time-series store '{store.directory}' already has data. Skipping seed.")
+        return 0
+    count, file_time = 0, int(os.path.getmtime(data_file))
+    for record in iter_records(data_file):
+        if record.get("company_slug"):
+            store.record({**record, "scraped_at": record.get("scraped_at") or file_time})
+            count += 1
+    print(f"Seeded {count} observations from '{data_file}'.")
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Follower and job-opening history per company.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    seed_parser = subparsers.add_parser("seed", help="Load observations from the stamped records already stored.")
+    seed_parser.add_argument("data_file", nargs="?", default="scraped_data.jsonl")
+    top_parser = subparsers.add_parser("top", help="Fastest-growing companies per industry.")
+    top_parser.add_argument("--metric", choices=METRICS, default="followers")
+    top_parser.add_argument("--days", type=int, default=90)
+    top_parser.add_argument("--top", type=int, default=5)
+    top_parser.add_argument("--relative", action="store_true", help="Rank by growth relative to the first value.")
+    history_parser = subparsers.add_parser("history", help="Print one company's observations.")
+    history_parser.add_argument("slug")
+    args = parser.parse_args()
+
+    timeseries = TimeSeriesStore()
+    if args.command == "seed":
+        seed_from_data_file(timeseries, args.data_file)
+    elif args.command == "top":
+        for industry, rows in sorted(top_growth_by_industry(timeseries, args.metric, args.days, args.top, args.relative).items()):
+            print(f"\n{industry}:")
+            for slug, first_value, last_value, change in rows:
+                print(f"  {slug:<48}{first_value:>12} -> {last_value:<12}{change:+.2%}" if args.relative else
+                      f"  {slug:<48}{first_value:>12} -> {last_value:<12}{change:+.0f}")
+    else:
+        for row in timeseries.history(args.slug):
+            print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(row['ts']))}  followers {row['followers']:>12}  job openings {row['job_openings']:>8}")
+    timeseries.close()